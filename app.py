@@ -1,15 +1,29 @@
 import streamlit as st
-from backend.scraping.instagram_scraper import scrape_instagram
-from backend.scraping.youtube_scraper import get_trending_reels
-from backend.updated_company_rag import CompanyRAG
-from backend.poster.poster import generate_poster
+from backend.pipeline import start_generation
+from backend.poster.poster import ASPECTS, MIME_TYPES
+from backend.poster.store import get_store
+from backend.registry import get_rag
 
 
 st.set_page_config(page_title="AutoSocial Club Generator", layout="wide")
 st.title(" Personalized Social Media Content Generator")
 
-# Initialize RAG with company data
-rag = CompanyRAG()
+# Initialize RAG with company data once per process, not on every rerun
+@st.cache_resource
+def load_rag():
+    return get_rag(snapshot_path="company_rag.pkl", response_cache_path="storage/llm_cache.sqlite3",
+                   semantic_cache_threshold=0.92)
+
+
+rag = load_rag()
+
+with st.sidebar:
+    st.subheader("Cache stats")
+    if rag.response_cache is not None:
+        st.json({"response_cache": rag.response_cache.stats()})
+    if rag.semantic_cache is not None:
+        st.json({"semantic_cache": rag.semantic_cache.stats()})
+    st.json({"poster_store": get_store().stats()})
 
 with st.form("event_form"):
     st.header("Enter Event Details")
@@ -19,6 +33,8 @@ with st.form("event_form"):
     event_time = st.text_input("Event Time", "")
     event_venue = st.text_input("Event Venue", "")
     hashtags = st.text_input("Extra Instagram topics (comma-separated)", "")
+    poster_aspect = st.selectbox("Poster size", list(ASPECTS), format_func=lambda a: f"{a} ({ASPECTS[a][0]}x{ASPECTS[a][1]})")
+    poster_format = st.selectbox("Poster format", list(MIME_TYPES))
     submitted = st.form_submit_button("Generate Content")
 
 if submitted:
@@ -26,24 +42,29 @@ if submitted:
         st.error("Please enter both Event Name and Event Description.")
     else:
         event = {"name": event_name, "about": event_about, "date": event_date, "time": event_time, "venue": event_venue}
+        topics = [h.strip() for h in hashtags.split(",") if h.strip()] + event_about.split()
+        # Scrapers and poster rendering run concurrently from here on
+        run = start_generation(event, rag.company_info, topics, aspect=poster_aspect, fmt=poster_format)
         with st.spinner("Scraping Instagram and YouTube for trends..."):
-            insta_tags = scrape_instagram(
-                [h.strip() for h in hashtags.split(",") if h.strip()] + event_about.split()
-            )
-            yt_trends = get_trending_reels(event_about or event_name)
+            insta_tags = run.result("instagram", [])
+            yt_trends = run.result("youtube", [])
         st.success(f"Found {len(insta_tags)} Instagram hashtags & {len(yt_trends)} YouTube trends.")
 
-        with st.spinner("Generating social media ideas with club info and trends..."):
-            content = rag.generate_content(event, insta_tags, yt_trends)
-
         st.subheader(" AI-Generated Social Media Content")
-        st.write(content)
+        content = st.write_stream(run.stream("llm", rag.generate_content_stream, event, insta_tags, yt_trends))
+        if "llm" in run.timed_out:
+            st.warning("Content generation ran past its time budget; the text above may be incomplete.")
 
         st.subheader(" Posters (choose a style and download)")
+        posters = run.result("posters", {})
         cols = st.columns(4)
         for style, col in enumerate(cols, 1):
-            poster_path = generate_poster(event, rag.company_info, style)
+            poster = posters.get(style)
             with col:
-                st.image(poster_path, caption=f"Style {style}")
-                with open(poster_path, "rb") as f:
-                    st.download_button(f"Download Style {style}", f, file_name=f"{event_name}_poster_style{style}.png")
+                if poster is None:
+                    st.warning(f"Style {style} could not be rendered in time.")
+                    continue
+                st.image(poster, caption=f"Style {style}")
+                st.download_button(f"Download Style {style} ({len(poster) // 1024} KB)", poster,
+                                   file_name=f"{event_name}_poster_style{style}_{poster_aspect}.{poster_format}",
+                                   mime=MIME_TYPES[poster_format])
@@ -0,0 +1,99 @@
+"""
+FAISS index factory for CompanyRAG.
+
+Every index is wrapped in an IDMap so documents keep stable ids regardless of
+the backend. "auto" picks a backend from the corpus size.
+"""
+import math
+
+INDEX_TYPES = ("auto", "flat", "ivf", "hnsw", "ivfpq", "sq8", "fp16")
+
+# Below this many vectors the quantizers are poorly trained and a flat scan is fast anyway.
+MIN_TRAINING_POINTS = 1000
+# 8-bit PQ codebooks have 256 centroids each and FAISS wants ~39 points per centroid.
+MIN_PQ_TRAINING_POINTS = 256 * 39
+AUTO_FLAT_LIMIT = 20_000
+AUTO_IVF_LIMIT = 500_000
+
+
+def _faiss():
+    import faiss
+    return faiss
+
+
+def choose_index_type(n):
+    if n < AUTO_FLAT_LIMIT:
+        return "flat"
+    if n < AUTO_IVF_LIMIT:
+        return "ivf"
+    return "ivfpq"
+
+
+def _nlist(n):
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def _pq_subquantizers(dim):
+    for m in (64, 48, 32, 16, 8, 4):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def factory_string(index_type, dim, n):
+    if index_type == "flat":
+        return "IDMap,Flat"
+    if index_type == "ivf":
+        return f"IDMap,IVF{_nlist(n)},Flat"
+    if index_type == "hnsw":
+        return "IDMap,HNSW32"
+    if index_type == "ivfpq":
+        return f"IDMap,IVF{_nlist(n)},PQ{_pq_subquantizers(dim)}"
+    if index_type == "sq8":
+        return "IDMap,SQ8"
+    if index_type == "fp16":
+        return "IDMap,SQfp16"
+    raise ValueError(f"Unknown index type {index_type!r}; expected one of {INDEX_TYPES}")
+
+
+def build_index(vectors, index_type="auto", nprobe=16, ef_search=64):
+    """
+    Create an empty, trained, ID-mapped index suited to `vectors`.
+    Types that need training fall back to flat when there is too little data.
+    """
+    n, dim = vectors.shape
+    if index_type == "auto":
+        index_type = choose_index_type(n)
+    if index_type == "ivfpq" and n < MIN_PQ_TRAINING_POINTS:
+        index_type = "ivf"
+    if index_type == "ivf" and n < MIN_TRAINING_POINTS:
+        index_type = "flat"
+    faiss = _faiss()
+    index = faiss.index_factory(dim, factory_string(index_type, dim, n))
+    if not index.is_trained:
+        index.train(vectors)
+    set_search_params(index, nprobe=nprobe, ef_search=ef_search)
+    return index
+
+
+def set_search_params(index, nprobe=16, ef_search=64):
+    faiss = _faiss()
+    inner = faiss.downcast_index(index.index) if hasattr(index, "index") else index
+    if hasattr(inner, "nprobe"):
+        inner.nprobe = min(nprobe, inner.nlist)
+    if hasattr(inner, "hnsw"):
+        inner.hnsw.efSearch = ef_search
+
+
+def index_nbytes(index):
+    """Approximate resident size of an index: stored codes plus the id map."""
+    faiss = _faiss()
+    inner = faiss.downcast_index(index.index) if hasattr(index, "index") else index
+    code_size = getattr(inner, "code_size", None) or getattr(getattr(inner, "storage", None), "code_size", 4 * index.d)
+    return index.ntotal * (code_size + 8)
+
+
+def describe(index):
+    faiss = _faiss()
+    inner = faiss.downcast_index(index.index) if hasattr(index, "index") else index
+    return type(inner).__name__
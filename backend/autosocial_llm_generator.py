@@ -1,11 +1,14 @@
-import requests
 import json
 import csv
-import re
+import os
+import sys
 from google.generativeai import configure, GenerativeModel
 
+# Make `backend` importable when run directly (python backend/autosocial_llm_generator.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.scraping import scrape
+
 # ============ CONFIGURATION ============
-import os
 from dotenv import load_dotenv
 import google.generativeai as genai
 
@@ -31,74 +34,12 @@ def scrape_instagram(hashtags):
     print("\nScraping Instagram...")
     if not hashtags:
         return []
-
-    payload = {
-        "hashtags": hashtags,
-        "resultsLimit": 2
-    }
-    url = f"https://api.apify.com/v2/acts/apify~instagram-hashtag-scraper/run-sync-get-dataset-items?token={APIFY_API_KEY}"
-    headers = {"Content-Type": "application/json"}
-
-    try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-
-        def find_hashtags(text):
-            return set(re.findall(r"#\w+", text)) if text else set()
-
-        extracted_hashtags = set()
-        for post in data:
-            extracted_hashtags.update(find_hashtags(post.get("caption", "")))
-            extracted_hashtags.update(find_hashtags(post.get("firstComment", "")))
-            for comment in post.get("latestComments", []):
-                extracted_hashtags.update(find_hashtags(comment.get("text", "")))
-
-        return sorted(extracted_hashtags)
-
-    except Exception as e:
-        print(f"Instagram scraping failed: {e}")
-        return []
+    return scrape("instagram", hashtags)
 
 # ============ SCRAPE YOUTUBE ============
 def scrape_youtube(event_description):
     print("Scraping YouTube Shorts...")
-    BASE_URL = "https://www.googleapis.com/youtube/v3/search"
-    params = {
-        "part": "snippet",
-        "q": event_description + " trending shorts",
-        "type": "video",
-        "videoDuration": "short",
-        "maxResults": 10,
-        "key": YOUTUBE_API_KEY
-    }
-
-    try:
-        response = requests.get(BASE_URL, params=params)
-        data = response.json()
-
-        if "items" not in data:
-            return []
-
-        trending_ideas = []
-        for item in data["items"]:
-            title = item["snippet"]["title"]
-            description = item["snippet"].get("description", "")
-            video_id = item["id"]["videoId"]
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            hashtags = [word for word in description.split() if word.startswith("#")]
-
-            trending_ideas.append({
-                "title": title,
-                "hashtags": hashtags,
-                "video_url": video_url
-            })
-
-        return trending_ideas
-
-    except Exception as e:
-        print(f"YouTube scraping failed: {e}")
-        return []
+    return scrape("youtube", event_description)
 
 # ============ RUN SCRAPERS ============
 instagram_hashtags = scrape_instagram(hashtags)
@@ -0,0 +1,101 @@
+"""
+Inverted index with BM25 scoring, used by CompanyRAG for hybrid retrieval.
+
+Hashtags are tokenised without the leading '#', so "#hackathon" in a query
+matches "hackathon" in the club description and vice versa.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return [t.lower() for t in TOKEN_RE.findall(text)]
+
+
+class BM25Index:
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)
+        self.doc_terms = {}
+        self.doc_len = {}
+        self.total_len = 0
+
+    def __len__(self):
+        return len(self.doc_len)
+
+    def add(self, doc_id, text):
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self.postings[term][doc_id] = tf
+        self.doc_terms[doc_id] = frozenset(terms)
+        self.doc_len[doc_id] = sum(terms.values())
+        self.total_len += self.doc_len[doc_id]
+
+    def remove(self, doc_id):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings[term]
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[term]
+        self.total_len -= self.doc_len.pop(doc_id)
+
+    def idf(self, term):
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.doc_len) - df + 0.5) / (df + 0.5))
+
+    def search(self, query, k=10):
+        """Return up to k (doc_id, score) pairs, best first, touching only matching postings."""
+        if not self.doc_len:
+            return []
+        avg_len = self.total_len / len(self.doc_len)
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / avg_len)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def is_confident(self, query, hits, margin=1.5):
+        """
+        True when the best hit contains every known query term and beats the
+        runner-up by `margin`, i.e. a dense re-rank is unlikely to change it.
+        """
+        if not hits:
+            return False
+        terms = {t for t in tokenize(query) if t in self.postings}
+        if not terms or len(terms) < len(set(tokenize(query))):
+            return False
+        best_id, best = hits[0]
+        if not terms <= self.doc_terms[best_id]:
+            return False
+        return len(hits) == 1 or best >= margin * hits[1][1]
+
+
+def fuse_scores(dense, lexical, k, alpha=0.5):
+    """
+    Blend min-max normalised dense similarities (from L2 distances) with
+    max-normalised BM25 scores. `alpha` is the dense weight.
+    """
+    scores = defaultdict(float)
+    if dense:
+        dists = [dist for _, dist in dense]
+        lo, hi = min(dists), max(dists)
+        for doc_id, dist in dense:
+            scores[doc_id] += alpha * (1.0 if hi == lo else (hi - dist) / (hi - lo))
+    if lexical:
+        top = lexical[0][1] or 1.0
+        for doc_id, score in lexical:
+            scores[doc_id] += (1 - alpha) * score / top
+    return [doc_id for doc_id, _ in heapq.nlargest(k, scores.items(), key=lambda item: item[1])]
@@ -0,0 +1,184 @@
+"""
+Caches shared by the RAG, scraping and poster modules: a bounded in-process
+LRU and a persistent SQLite key/value store with TTL and size eviction.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used mapping with hit/miss counters."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+def prompt_cache_key(prompt, model_name):
+    """Hash of the whitespace-normalised prompt and model name."""
+    normalized = re.sub(r"\s+", " ", prompt).strip()
+    return hashlib.sha256(f"{model_name}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """
+    Persistent JSON-valued cache in a SQLite table. Entries older than `ttl`
+    seconds are treated as misses and purged; past `max_entries` the least
+    recently used rows are deleted.
+    """
+
+    def __init__(self, path, table="cache", ttl=None, max_entries=None):
+        if not re.fullmatch(r"\w+", table):
+            raise ValueError(f"Invalid table name: {table!r}")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed)")
+        self._count = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    self._count -= 1
+                self.misses += 1
+                return default
+            with self._conn:
+                self._conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def get_many(self, keys):
+        """Return {key: value} for the keys that are cached and fresh."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            with self._conn:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now),
+                )
+            if not exists:
+                self._count += 1
+            self._evict()
+
+    def _evict(self):
+        if self.max_entries is None or self._count <= self.max_entries:
+            return
+        with self._conn:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed LIMIT ?)",
+                (self._count - self.max_entries,),
+            )
+        self._count = self.max_entries
+
+    def recent(self, limit=50):
+        """Values of the most recently used fresh entries, newest first."""
+        since = time.time() - self.ttl if self.ttl is not None else float("-inf")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT value FROM {self.table} WHERE created >= ? ORDER BY accessed DESC LIMIT ?", (since, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def delete(self, key):
+        with self._lock, self._conn:
+            cur = self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._count -= cur.rowcount
+
+    def purge_expired(self):
+        if self.ttl is None:
+            return 0
+        with self._lock, self._conn:
+            cur = self._conn.execute(f"DELETE FROM {self.table} WHERE created < ?", (time.time() - self.ttl,))
+            self._count -= cur.rowcount
+            return cur.rowcount
+
+    def __len__(self):
+        return self._count
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": self._count,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+        }
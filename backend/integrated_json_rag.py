@@ -1,7 +1,5 @@
-import requests
 import json
 import csv
-import re
 
 import sys
 from backend.updated_company_rag import CompanyRAG  # Import the updated RAG system
@@ -9,6 +7,7 @@ from backend.updated_company_rag import CompanyRAG  # Import the updated RAG sys
 import os
 from dotenv import load_dotenv
 import google.generativeai as genai
+from backend.scraping import scrape
 
 # Load environment variables from .env file
 load_dotenv()
@@ -27,87 +26,20 @@ def scrape_instagram_hashtags(hashtags, results_limit=2):
     """
     Scrape hashtags from Instagram posts using Apify's Instagram Hashtag Scraper
     """
-    payload = {
-        "hashtags": hashtags,
-        "resultsLimit": results_limit
-    }
-
-    url = f"https://api.apify.com/v2/acts/apify~instagram-hashtag-scraper/run-sync-get-dataset-items?token={APIFY_API_KEY}"
-    headers = {"Content-Type": "application/json"}
-
-    try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-
-        if not data:
-            print("No Instagram data returned.")
-            return []
-
-        def find_hashtags(text):
-            return set(re.findall(r"#\w+", text)) if text else set()
-
-        extracted_hashtags = set()
-
-        for post in data:
-            extracted_hashtags.update(find_hashtags(post.get("caption", "")))
-            extracted_hashtags.update(find_hashtags(post.get("firstComment", "")))
-
-            for comment in post.get("latestComments", []):
-                extracted_hashtags.update(find_hashtags(comment.get("text", "")))
-
-        return sorted(list(extracted_hashtags))
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error scraping Instagram hashtags: {e}")
-        return []
+    hashtags = scrape("instagram", hashtags, results_limit=results_limit)
+    if not hashtags:
+        print("No Instagram data returned.")
+    return hashtags
 
 def get_youtube_trending_reels(event_description):
     """
     Fetch trending YouTube Shorts based on the given event description.
     Extracts video titles, hashtags, and video URLs.
     """
-    search_query = event_description + " trending shorts"
-    base_url = "https://www.googleapis.com/youtube/v3/search"
-    params = {
-        "part": "snippet",
-        "q": search_query,
-        "type": "video",
-        "videoDuration": "short",
-        "maxResults": 10,
-        "key": YOUTUBE_API_KEY
-    }
-    
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        if "items" not in data:
-            print("No YouTube data returned or API error.")
-            return []
-        
-        trending_ideas = []
-        
-        for item in data["items"]:
-            title = item["snippet"]["title"]
-            description = item["snippet"].get("description", "")
-            video_id = item["id"]["videoId"]
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            
-            hashtags = [word for word in description.split() if word.startswith("#")]
-            
-            trending_ideas.append({
-                "title": title,
-                "hashtags": hashtags,
-                "video_url": video_url
-            })
-        
-        return trending_ideas
-    
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching YouTube trends: {e}")
-        return []
+    trending_ideas = scrape("youtube", event_description)
+    if not trending_ideas:
+        print("No YouTube data returned or API error.")
+    return trending_ideas
 
 def extract_youtube_hashtags(youtube_data):
     """
@@ -136,17 +68,13 @@ def setup_rag_system():
     """
     Set up or load the RAG system
     """
-    rag = CompanyRAG()
     rag_file = "company_rag.pkl"
     json_file = "company_details.json"
     
-    # Check for existing RAG system
+    # Reuses the snapshot when present; only changed paragraphs are re-embedded
     if os.path.exists(rag_file):
         print("Loading existing RAG system...")
-        if rag.load_from_disk(rag_file):
-            print("RAG system loaded successfully.")
-        else:
-            print("Failed to load existing RAG system.")
+    rag = CompanyRAG(snapshot_path=rag_file)
     
     # If no company info is loaded, try loading from JSON
     if not rag.company_info and os.path.exists(json_file):
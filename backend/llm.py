@@ -0,0 +1,36 @@
+"""
+Offline LLM backend with the same generate_content interface as
+google.generativeai.GenerativeModel, including stream=True.
+
+Select it for the whole process with LLM_BACKEND=fake, or install it under a
+model name with backend.registry.register_llm.
+"""
+import time
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeLLM:
+    def __init__(self, first_token_delay=0.3, chunk_delay=0.02, chunk_words=4):
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.chunk_words = chunk_words
+
+    def _chunks(self, prompt):
+        words = ("Offline draft for a student club post. " + prompt.splitlines()[-1]).split(" ")
+        for i in range(0, len(words), self.chunk_words):
+            yield " ".join(words[i:i + self.chunk_words]) + " "
+
+    def _stream(self, prompt):
+        time.sleep(self.first_token_delay)
+        for chunk in self._chunks(prompt):
+            yield FakeResponse(chunk)
+            time.sleep(self.chunk_delay)
+
+    def generate_content(self, prompt, stream=False):
+        if stream:
+            return self._stream(prompt)
+        return FakeResponse("".join(chunk.text for chunk in self._stream(prompt)))
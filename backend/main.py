@@ -1,3 +1,4 @@
+import os
 from fastapi import FastAPI
 import uvicorn
 from routes import router
@@ -7,6 +8,24 @@ app = FastAPI()
 # Include scraping routes
 app.include_router(router)
 
+@app.on_event("startup")
+def start_trend_prewarmer():
+    # Opt-in background scraping so interactive requests hit warm caches
+    if os.getenv("PREWARM_TRENDS") == "1":
+        from backend.scheduler import build_default_prewarmer
+        interval = float(os.getenv("PREWARM_INTERVAL", 1800))
+        app.state.prewarmer = build_default_prewarmer(interval=interval).start()
+
+@app.on_event("shutdown")
+async def close_connections():
+    prewarmer = getattr(app.state, "prewarmer", None)
+    if prewarmer is not None:
+        prewarmer.stop(timeout=5)
+    from backend.database import async_engine
+    from backend.scraping.http import aclose_async_client
+    await aclose_async_client()
+    await async_engine.dispose()
+
 @app.get("/")
 def home():
     return {"message": "AutoSocial API is running!"}
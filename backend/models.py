@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -6,7 +6,39 @@ Base = declarative_base()
 
 class TrendingTopic(Base):
     __tablename__ = "trending_topics"
+    __table_args__ = (
+        # One row per keyword per platform per time bucket; repeats bump `count`
+        UniqueConstraint("platform", "normalized_keyword", "time_bucket", name="uq_trending_topics_bucket"),
+        Index("ix_trending_topics_timestamp", "timestamp"),
+        Index("ix_trending_topics_platform_timestamp", "platform", "timestamp"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     platform = Column(String, nullable=False)       # E.g. Instagram, YouTube
     keyword = Column(String, nullable=False)
+    normalized_keyword = Column(String, nullable=False)
+    time_bucket = Column(DateTime, nullable=False)
+    count = Column(Integer, nullable=False, default=1)
     timestamp = Column(DateTime, default=datetime.utcnow)
+
+class _TrendRollup:
+    platform = Column(String, nullable=False)
+    normalized_keyword = Column(String, nullable=False)
+    keyword = Column(String, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+class TrendRollupHourly(_TrendRollup, Base):
+    __tablename__ = "trend_rollups_hourly"
+    __table_args__ = (
+        UniqueConstraint("platform", "normalized_keyword", "bucket_start", name="uq_trend_rollups_hourly"),
+        Index("ix_trend_rollups_hourly_bucket", "bucket_start", "platform"),
+    )
+    id = Column(Integer, primary_key=True)
+
+class TrendRollupDaily(_TrendRollup, Base):
+    __tablename__ = "trend_rollups_daily"
+    __table_args__ = (
+        UniqueConstraint("platform", "normalized_keyword", "bucket_start", name="uq_trend_rollups_daily"),
+        Index("ix_trend_rollups_daily_bucket", "bucket_start", "platform"),
+    )
+    id = Column(Integer, primary_key=True)
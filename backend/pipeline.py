@@ -0,0 +1,139 @@
+"""
+Concurrent orchestration of the content generation request.
+
+Instagram and YouTube scraping run side by side, and poster rendering starts
+straight away since it only needs the event and club details, so it overlaps
+with both the scrapers and the Gemini call. Every stage has its own time
+budget; a stage that overruns yields its default instead of stalling the
+request.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from backend.poster.poster import render_posters
+from backend.poster.store import get_store
+from backend.scraping import scrape
+
+DEFAULT_BUDGETS = {"instagram": 35.0, "youtube": 20.0, "llm": 90.0, "posters": 30.0}
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="pipeline")
+
+
+class PipelineRun:
+    def __init__(self, budgets=None, executor=None):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.executor = executor or _executor
+        self.timings = {}
+        self.timed_out = []
+        self._futures = {}
+        self._started = {}
+
+    def _budget(self, stage):
+        # "stage:suffix" falls back to the budget of "stage".
+        return self.budgets.get(stage, self.budgets.get(stage.split(":")[0], 30.0))
+
+    def _finished(self, stage):
+        # First record wins: the completion time, or the moment result() gave up on the stage
+        self.timings.setdefault(stage, time.perf_counter() - self._started[stage])
+
+    def submit(self, stage, fn, *args, **kwargs):
+        self._started[stage] = time.perf_counter()
+        self.timings.pop(stage, None)
+        future = self.executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(lambda _: self._finished(stage))
+        self._futures[stage] = future
+
+    def result(self, stage, default=None):
+        """Wait for a stage within what is left of its budget; return `default` on timeout or error."""
+        remaining = self._started[stage] + self._budget(stage) - time.perf_counter()
+        try:
+            value = self._futures[stage].result(timeout=max(0.0, remaining))
+        except TimeoutError:
+            print(f"Pipeline stage {stage} exceeded its {self._budget(stage):.0f}s budget")
+            self.timed_out.append(stage)
+            value = default
+        except Exception as e:
+            print(f"Pipeline stage {stage} failed: {e}")
+            value = default
+        self._finished(stage)
+        return value
+
+    def stream(self, stage, fn, *args, **kwargs):
+        """
+        Run generator `fn` as a stage and yield its items until the stage's
+        budget is spent. A stream cut short is recorded in timed_out; what was
+        yielded so far stands.
+        """
+        self._started[stage] = start = time.perf_counter()
+        self.timings.pop(stage, None)
+        items = queue.Queue()
+        cancelled = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for item in fn(*args, **kwargs):
+                    if cancelled.is_set():
+                        return
+                    items.put(item)
+            except Exception as e:
+                print(f"Pipeline stage {stage} failed: {e}")
+            finally:
+                items.put(done)
+
+        self.executor.submit(produce)
+        deadline = start + self._budget(stage)
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    print(f"Pipeline stage {stage} exceeded its {self._budget(stage):.0f}s budget")
+                    self.timed_out.append(stage)
+                    return
+                if item is done:
+                    return
+                yield item
+        finally:
+            cancelled.set()
+            self._finished(stage)
+
+
+def render_styles(event, club, styles, store=None, aspect="portrait", fmt="png"):
+    jobs = [(event, style) for style in styles]
+    return dict(zip(styles, render_posters(jobs, club, store or get_store(), aspect, fmt)))
+
+
+def start_generation(event, club, topics, styles=(1, 2, 3, 4), budgets=None, aspect="portrait", fmt="png",
+                     store=None):
+    """
+    Kick off scraping and poster rendering; returns the PipelineRun to collect from.
+    Posters go to `store`, or the default designed_posters/ store when it is None.
+    """
+    run = PipelineRun(budgets)
+    run.submit("instagram", scrape, "instagram", topics)
+    run.submit("youtube", scrape, "youtube", event["about"] or event["name"])
+    run.submit("posters", render_styles, event, club, styles, store, aspect, fmt)
+    return run
+
+
+def run_pipeline(rag, event, topics, styles=(1, 2, 3, 4), budgets=None, store=None):
+    """Blocking end-to-end run: trends, LLM content and posters, with per-stage timings."""
+    start = time.perf_counter()
+    run = start_generation(event, rag.company_info, topics, styles, budgets, store=store)
+    insta_tags = run.result("instagram", [])
+    yt_trends = run.result("youtube", [])
+    run.submit("llm", rag.generate_content, event, insta_tags, yt_trends)
+    content = run.result("llm", "")
+    posters = run.result("posters", {})
+    run.timings["total"] = time.perf_counter() - start
+    return {
+        "instagram_hashtags": insta_tags,
+        "youtube_trends": yt_trends,
+        "content": content,
+        "posters": posters,
+        "timings": run.timings,
+        "timed_out": run.timed_out,
+    }
@@ -0,0 +1,35 @@
+"""
+Background primitives shared by the poster styles. Everything here runs in
+PIL's C code: no per-pixel Python loops.
+"""
+from PIL import Image, ImageDraw
+
+
+def solid(size, color):
+    return Image.new("RGB", size, color)
+
+
+def gradient_mask(size, vertical=True):
+    """"L" mask ramping 0 -> 255 across the image (top to bottom by default).
+
+    Only one row/column of ramp values is computed; PIL stretches it to the
+    full size with a nearest-neighbour resize.
+    """
+    width, height = size
+    length = height if vertical else width
+    ramp = bytes(255 * i // length for i in range(length))
+    strip = Image.frombytes("L", (1, length) if vertical else (length, 1), ramp)
+    return strip.resize(size, Image.NEAREST)
+
+
+def linear_gradient(size, start, end, vertical=True):
+    """RGB gradient from `start` to `end` colour."""
+    return Image.composite(solid(size, end), solid(size, start), gradient_mask(size, vertical))
+
+
+def translucent_shapes(img, shapes):
+    """Draw ("ellipse" | "rectangle", box, "#RRGGBBAA") shapes alpha-blended onto img."""
+    draw = ImageDraw.Draw(img, "RGBA")
+    for kind, box, fill in shapes:
+        getattr(draw, kind)(box, fill=fill)
+    return img
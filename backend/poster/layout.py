@@ -0,0 +1,126 @@
+"""
+Text layout for posters: greedy word wrapping and fit-to-box by binary
+search on the font size. Widths come from per-font glyph advance tables
+that are filled once per character, so fitting a paragraph costs a few
+dictionary lookups per word instead of a FreeType measurement per try.
+"""
+from functools import lru_cache
+from PIL import ImageFont
+
+LINE_SPACING = 1.15
+MIN_FONT_SIZE = 20
+ELLIPSIS = "..."
+
+
+@lru_cache(maxsize=128)
+def get_font(path, size):
+    """Load a TrueType font once per process, falling back to PIL's default."""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+class _AdvanceTable(dict):
+    """char -> advance width for one font, measured on first use."""
+
+    def __init__(self, font):
+        super().__init__()
+        self.font = font
+
+    def __missing__(self, char):
+        width = self[char] = self.font.getlength(char)
+        return width
+
+
+@lru_cache(maxsize=128)
+def glyph_widths(font):
+    return _AdvanceTable(font)
+
+
+def text_width(text, font):
+    # Sum of advances ignores kerning, which is a few pixels at most per line
+    widths = glyph_widths(font)
+    return sum(widths[char] for char in text)
+
+
+def line_height(font, spacing=LINE_SPACING):
+    ascent, descent = font.getmetrics()
+    return round((ascent + descent) * spacing)
+
+
+def wrap_text(text, font, max_width):
+    """Greedy word wrap; words wider than the line are broken between characters."""
+    widths = glyph_widths(font)
+    space = widths[" "]
+    lines, current, current_width = [], [], 0.0
+    for word in text.split():
+        word_width = text_width(word, font)
+        if word_width > max_width:
+            if current:
+                lines.append(" ".join(current))
+                current, current_width = [], 0.0
+            piece, piece_width = "", 0.0
+            for char in word:
+                if piece and piece_width + widths[char] > max_width:
+                    lines.append(piece)
+                    piece, piece_width = "", 0.0
+                piece += char
+                piece_width += widths[char]
+            current, current_width = [piece], piece_width
+            continue
+        extra = word_width + (space if current else 0)
+        if current and current_width + extra > max_width:
+            lines.append(" ".join(current))
+            current, current_width = [word], word_width
+        else:
+            current.append(word)
+            current_width += extra
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def _truncate(lines, font, max_lines, max_width):
+    kept = lines[:max_lines]
+    last = kept[-1]
+    while last and text_width(last + ELLIPSIS, font) > max_width:
+        last = last[:-1]
+    kept[-1] = last.rstrip() + ELLIPSIS
+    return kept
+
+
+def fit_text(text, font_path, box_width, box_height, max_size, min_size=MIN_FONT_SIZE):
+    """Largest font size in [min_size, max_size] whose wrapped text fits the box.
+
+    Returns (font, lines, line_height). If even min_size overflows, the text
+    is cut to the lines that fit and ends with an ellipsis.
+    """
+    def attempt(size):
+        font = get_font(font_path, size)
+        lines = wrap_text(text, font, box_width)
+        step = line_height(font)
+        return font, lines, step, len(lines) * step <= box_height
+
+    low, high = min_size, max(min_size, max_size)
+    best = None
+    while low <= high:
+        size = (low + high) // 2
+        font, lines, step, fits = attempt(size)
+        if fits:
+            best = (font, lines, step)
+            low = size + 1
+        else:
+            high = size - 1
+    if best is not None:
+        return best
+    font, lines, step, _ = attempt(min_size)
+    max_lines = max(1, box_height // step)
+    if len(lines) > max_lines:
+        lines = _truncate(lines, font, max_lines, box_width)
+    return font, lines, step
+
+
+def clear_caches():
+    get_font.cache_clear()
+    glyph_widths.cache_clear()
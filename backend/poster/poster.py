@@ -1,76 +1,200 @@
-from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from PIL import ImageDraw
+import io
+import multiprocessing
 import os
+import threading
+from backend.poster import effects
+from backend.poster.layout import clear_caches as clear_layout_caches, fit_text, get_font
+from backend.poster.store import get_store, poster_key
 
-def generate_poster(event, club, style=1, save_dir="designed_posters"):
-    width, height = 1080, 1350
-    os.makedirs(save_dir, exist_ok=True)
-    try:
-        title_font = ImageFont.truetype("arialbd.ttf", 90)
-        desc_font  = ImageFont.truetype("arial.ttf", 50)
-        detail_font= ImageFont.truetype("arial.ttf", 45)
-    except:
-        title_font = desc_font = detail_font = ImageFont.load_default()
-    title, desc, venue, date, time = event['name'], event['about'], event['venue'], event['date'], event['time']
-
-    def draw_centered(draw, text, y, font, color):
-        text_bbox = draw.textbbox((0, 0), text, font=font)
-        x_pos = (width - (text_bbox[2] - text_bbox[0])) // 2
-        draw.text((x_pos, y), text, font=font, fill=color)
-
-    def design_one():
-        base = Image.new('RGB', (width, height), "#FFD93D")
-        draw = ImageDraw.Draw(base)
-        draw_centered(draw, title, 160, title_font, "#2D2D2D")
-        draw_centered(draw, desc, 300, desc_font, "#2D2D2D")
-        y = 470
-        for label, val in [("Venue:", venue), ("Date:", date), ("Time:", time)]:
-            draw_centered(draw, f"{label} {val}", y, detail_font, "#2D2D2D")
-            y += 70
-        return base
-
-    def design_two():
-        base = Image.new('RGB', (width, height), "#4caf50")
-        draw = ImageDraw.Draw(base)
-        draw_centered(draw, title, 120, title_font, "#1B5E20")
-        draw_centered(draw, desc, 260, desc_font, "#2E7D32")
-        y = 430
-        for label, val in [("Venue:", venue), ("Date:", date), ("Time:", time)]:
-            draw_centered(draw, f"{label} {val}", y, detail_font, "#1B5E20")
-            y += 75
-        return base
-
-    def design_three():
-        base = Image.new('RGB', (width, height), "#2c5364")
-        draw = ImageDraw.Draw(base)
-        draw_centered(draw, title, 120, title_font, "#00c9a7")
-        draw_centered(draw, desc, 250, desc_font, "#00c9a7")
-        y = 400
-        for label, val in [("Venue:", venue), ("Date:", date), ("Time:", time)]:
-            draw_centered(draw, f"{label} {val}", y, detail_font, "#00c9a7")
-            y += 80
-        return base
-
-    def design_four():
-        img = Image.new("RGB", (width, height), "#020024")
-        mask = Image.new("L", (width, height))
-        mask_data = [int(255 * (y / height)) for y in range(height) for _ in range(width)]
-        mask.putdata(mask_data)
-        top = Image.new("RGB", (width, height), "#7900FF")
-        img.paste(top, (0, 0), mask)
-        draw = ImageDraw.Draw(img, "RGBA")
-        draw.ellipse((100, 100, 500, 500), fill="#FF3CAC44")
-        draw.rectangle((600, 400, 1000, 800), fill="#FFFFFF22")
-        draw_centered(draw, title, 140, title_font, "white")
-        draw_centered(draw, desc, 290, desc_font, "white")
-        y = 470
-        for label, val in [("Venue:", venue), ("Date:", date), ("Time:", time)]:
-            draw_centered(draw, f"{label} {val}", y, detail_font, "white")
-            y += 80
-        return img
-
-    designs = [design_one, design_two, design_three, design_four]
-    fn = designs[style - 1]
-    poster = fn()
-    filepath = os.path.join(save_dir, f"{title}_poster_style{style}.png")
-    poster.save(filepath)
-    return filepath
+WIDTH, HEIGHT = 1080, 1350
+TEMPLATE_CACHE_SIZE = 8  # ~4.4 MB per 1080x1350 RGB template
+RENDER_WORKERS = min(4, os.cpu_count() or 1)
+TEXT_MARGIN = 60  # horizontal padding either side of the text column
+
+# Output canvases. Styles are designed on the portrait canvas and placed onto the others.
+ASPECTS = {"portrait": (WIDTH, HEIGHT), "story": (1080, 1920), "square": (1080, 1080)}
+
+# Encoder settings per output format; `quality` only applies to the lossy ones.
+ENCODERS = {
+    "png": {"format": "PNG", "optimize": True},
+    "jpeg": {"format": "JPEG", "quality": 85, "optimize": True, "progressive": True},
+    "webp": {"format": "WEBP", "quality": 85, "method": 4},
+}
+MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _style_four_background(size):
+    # Shape coordinates are for the portrait canvas; stretch them vertically for other heights
+    sy = size[1] / HEIGHT
+    return effects.translucent_shapes(
+        effects.linear_gradient(size, "#020024", "#7900FF"),
+        [("ellipse", (100, round(100 * sy), 500, round(500 * sy)), "#FF3CAC44"),
+         ("rectangle", (600, round(400 * sy), 1000, round(800 * sy)), "#FFFFFF22")])
+
+
+# Static parts of each style: background layer, text colours and vertical layout.
+STYLES = {
+    1: {"background": lambda size: effects.solid(size, "#FFD93D"),
+        "colors": ("#2D2D2D", "#2D2D2D", "#2D2D2D"), "title_y": 160, "desc_y": 300, "details_y": 470, "line_gap": 70},
+    2: {"background": lambda size: effects.solid(size, "#4caf50"),
+        "colors": ("#1B5E20", "#2E7D32", "#1B5E20"), "title_y": 120, "desc_y": 260, "details_y": 430, "line_gap": 75},
+    3: {"background": lambda size: effects.solid(size, "#2c5364"),
+        "colors": ("#00c9a7", "#00c9a7", "#00c9a7"), "title_y": 120, "desc_y": 250, "details_y": 400, "line_gap": 80},
+    4: {"background": _style_four_background,
+        "colors": ("white", "white", "white"), "title_y": 140, "desc_y": 290, "details_y": 470, "line_gap": 80},
+}
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_template(style, size=(WIDTH, HEIGHT)):
+    """Pre-rendered static layer for a style. Callers must copy() before drawing."""
+    return STYLES[style]["background"](size)
+
+
+def clear_caches():
+    clear_layout_caches()
+    get_template.cache_clear()
+
+
+def layout_poster(event, style=1):
+    """Lay the event text out once: (text, font, color, y, width) per line on the portrait canvas.
+
+    A field that fits the canvas width on one line at its design size is
+    drawn exactly as before. Only fields that would run off the canvas are
+    wrapped and shrunk to fit their slot.
+    """
+    spec = STYLES[style]
+    title_color, desc_color, detail_color = spec["colors"]
+    box_width = WIDTH - 2 * TEXT_MARGIN
+
+    # (text, font file, max size, color, top, slot height)
+    fields = [(event['name'], "arialbd.ttf", 90, title_color, spec["title_y"], spec["desc_y"] - spec["title_y"] - 10),
+              (event['about'], "arial.ttf", 50, desc_color, spec["desc_y"], spec["details_y"] - spec["desc_y"] - 20)]
+    y = spec["details_y"]
+    for label, key in [("Venue:", "venue"), ("Date:", "date"), ("Time:", "time")]:
+        fields.append((f"{label} {event[key]}", "arial.ttf", 45, detail_color, y, spec["line_gap"]))
+        y += spec["line_gap"]
+
+    lines = []
+    for text, font_path, max_size, color, top, slot_height in fields:
+        font = get_font(font_path, max_size)
+        bbox = font.getbbox(text)
+        if bbox[2] - bbox[0] <= WIDTH:
+            lines.append((text, font, color, top, bbox[2] - bbox[0]))
+            continue
+        font, wrapped, step = fit_text(text, font_path, box_width, slot_height, max_size)
+        for i, line in enumerate(wrapped):
+            bbox = font.getbbox(line)
+            lines.append((line, font, color, top + i * step, bbox[2] - bbox[0]))
+    return lines
+
+
+def render_poster(event, style=1, size=(WIDTH, HEIGHT), layout=None):
+    """Render one poster in memory: a copy of the cached template plus the event text.
+
+    The text block keeps its line spacing on every canvas; only its top edge
+    moves in proportion to the canvas height.
+    """
+    lines = layout or layout_poster(event, style)
+    poster = get_template(style, size).copy()
+    draw = ImageDraw.Draw(poster)
+    top = lines[0][3]
+    shift = round(top * size[1] / HEIGHT) - top
+    for text, font, color, y, text_width in lines:
+        draw.text(((size[0] - text_width) // 2, y + shift), text, font=font, fill=color)
+    return poster
+
+
+def generate_poster(event, club, style=1, save_dir="designed_posters", aspect="portrait", fmt="png"):
+    """Render one poster into the content-addressed store under save_dir; returns its path."""
+    store = get_store(save_dir)
+    key = poster_key(event, club, style, ASPECTS[aspect], fmt)
+    if store.get(key, fmt) is None:
+        store.put(key, encode_poster(render_poster(event, style, ASPECTS[aspect]), fmt), fmt)
+    return store.path(key, fmt)
+
+
+def encode_poster(poster, fmt="png", quality=None):
+    options = dict(ENCODERS[fmt])
+    if quality is not None and "quality" in options:
+        options["quality"] = quality
+    buf = io.BytesIO()
+    poster.save(buf, **options)
+    return buf.getvalue()
+
+
+def _render_encoded(event, style, size=(WIDTH, HEIGHT), fmt="png", quality=None):
+    # Runs in a worker process, which keeps its own font and template caches
+    return encode_poster(render_poster(event, style, size), fmt, quality)
+
+
+def render_poster_set(event, club=None, style=1, aspects=tuple(ASPECTS), fmt="png", quality=None, store=None):
+    """Encode one style in several aspect ratios from a single layout pass; returns {aspect: bytes}."""
+    layout = None
+    results = {}
+    for aspect in aspects:
+        size = ASPECTS[aspect]
+        key = poster_key(event, club, style, size, fmt, quality)
+        data = store.get(key, fmt) if store is not None else None
+        if data is None:
+            layout = layout or layout_poster(event, style)
+            data = encode_poster(render_poster(event, style, size, layout), fmt, quality)
+            if store is not None:
+                store.put(key, data, fmt)
+        results[aspect] = data
+    return results
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Never fork: the app process is multi-threaded (Streamlit, torch, faiss), and a forked
+            # child can inherit a lock some other thread was holding.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=context)
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def render_posters(jobs, club=None, store=None, aspect="portrait", fmt="png", quality=None):
+    """Render (event, style) jobs across the worker pool; returns encoded bytes in job order.
+
+    With a PosterStore, posters already in it are read back instead of rendered, and new ones are added.
+    """
+    jobs = list(jobs)
+    size = ASPECTS[aspect]
+    keys = [poster_key(event, club, style, size, fmt, quality) for event, style in jobs]
+    results = [store.get(key, fmt) if store is not None else None for key in keys]
+    missing = [i for i, data in enumerate(results) if data is None]
+    if len(missing) <= 1 or RENDER_WORKERS == 1:
+        rendered = [_render_encoded(*jobs[i], size, fmt, quality) for i in missing]
+    else:
+        pool = _get_pool()
+        try:
+            rendered = [f.result() for f in [pool.submit(_render_encoded, *jobs[i], size, fmt, quality) for i in missing]]
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool next time and finish this batch here
+            print("Poster worker pool broke; rendering this batch in-process")
+            _discard_pool(pool)
+            rendered = [_render_encoded(*jobs[i], size, fmt, quality) for i in missing]
+    for i, data in zip(missing, rendered):
+        results[i] = data
+        if store is not None:
+            store.put(keys[i], data, fmt)
+    return results
@@ -0,0 +1,107 @@
+"""
+Content-addressed poster store. A poster's file name is the hash of
+everything that affects its bytes (event fields, club branding, style,
+size, format, quality), so identical requests are served from disk and
+different events can never overwrite each other. The directory is capped in bytes and
+evicts least recently used posters first.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+
+RENDER_VERSION = 4  # bump when rendering changes so stale posters are not served
+EVENT_FIELDS = ("name", "about", "venue", "date", "time")
+BRANDING_FIELDS = ("name", "logo_url")
+DEFAULT_MAX_BYTES = int(float(os.getenv("POSTER_STORE_MAX_MB", 500)) * 2**20)
+
+# Only files this store wrote are ever evicted
+_HASHED_NAME = re.compile(r"^[0-9a-f]{64}\.[a-z]+$")
+
+
+def poster_key(event, club, style, size, fmt="png", quality=None):
+    payload = {
+        "version": RENDER_VERSION,
+        "event": {field: str(event.get(field, "")) for field in EVENT_FIELDS},
+        "club": {field: str((club or {}).get(field, "")) for field in BRANDING_FIELDS},
+        "style": style,
+        "size": list(size),
+        "format": fmt.lower(),
+        "quality": quality,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class PosterStore:
+    def __init__(self, root="designed_posters", max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._entries())
+
+    def path(self, key, fmt="png"):
+        return os.path.join(self.root, f"{key}.{fmt.lower()}")
+
+    def get(self, key, fmt="png"):
+        path = self.path(key, fmt)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # mtime doubles as the LRU clock
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data, fmt="png"):
+        path = self.path(key, fmt)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._evict()
+        return path
+
+    def _entries(self):
+        for entry in os.scandir(self.root):
+            if _HASHED_NAME.match(entry.name) and entry.is_file():
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        # Rescan rather than trust the running total: other processes share the directory
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        self._bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._bytes -= size
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_store(root="designed_posters"):
+    """One PosterStore per directory per process."""
+    return PosterStore(root)
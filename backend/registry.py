@@ -0,0 +1,64 @@
+"""
+Process-wide registry for the heavy shared objects: embedding models, the
+Gemini client and CompanyRAG instances. Each is imported and built on first
+use and then reused, so Streamlit reruns and new sessions pay for it once.
+"""
+import os
+import threading
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_LLM_MODEL = "gemini-2.0-flash-lite"
+
+_lock = threading.RLock()
+_embedding_models = {}
+_llms = {}
+_rags = {}
+
+
+def get_embedding_model(model_name=DEFAULT_EMBEDDING_MODEL):
+    with _lock:
+        if model_name not in _embedding_models:
+            from sentence_transformers import SentenceTransformer
+            _embedding_models[model_name] = SentenceTransformer(model_name)
+        return _embedding_models[model_name]
+
+
+def get_llm(model_name=DEFAULT_LLM_MODEL):
+    with _lock:
+        if model_name not in _llms and os.getenv("LLM_BACKEND") == "fake":
+            from backend.llm import FakeLLM
+            _llms[model_name] = FakeLLM()
+        if model_name not in _llms:
+            import google.generativeai as genai
+            from dotenv import load_dotenv
+            load_dotenv()
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            _llms[model_name] = genai.GenerativeModel(model_name)
+        return _llms[model_name]
+
+
+def register_llm(model_name, llm):
+    """Install an object with a generate_content(prompt) method under `model_name`."""
+    with _lock:
+        _llms[model_name] = llm
+
+
+def get_rag(json_path="data/company_details.json", snapshot_path=None, model_name=DEFAULT_EMBEDDING_MODEL,
+            **options):
+    """Shared CompanyRAG; extra options are passed to the constructor and are part of the key."""
+    key = (os.path.abspath(json_path), snapshot_path and os.path.abspath(snapshot_path), model_name,
+           tuple(sorted(options.items())))
+    with _lock:
+        if key not in _rags:
+            from backend.updated_company_rag import CompanyRAG
+            _rags[key] = CompanyRAG(model_name=model_name, json_path=json_path, snapshot_path=snapshot_path,
+                                    **options)
+        return _rags[key]
+
+
+def clear():
+    """Forget every cached object (mainly for benchmarks)."""
+    with _lock:
+        _embedding_models.clear()
+        _llms.clear()
+        _rags.clear()
@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from backend.database import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database import get_async_db
 from backend.models import TrendingTopic
-from backend.scraping import fetch_trending_hashtags  # Optional generic scraper
+from backend.scraping import fetch_trending_hashtags_async  # Optional generic scraper
+from backend.trend_store import save_trends, top_trends
 
 router = APIRouter()
 
 @router.get("/trends")
-def get_trending_topics(db: Session = Depends(get_db)):
-    topics = db.query(TrendingTopic).order_by(TrendingTopic.timestamp.desc()).limit(10).all()
-    return {"trending_topics": [t.keyword for t in topics]}
+async def get_trending_topics(db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(TrendingTopic.keyword).order_by(TrendingTopic.timestamp.desc()).limit(10))
+    return {"trending_topics": result.scalars().all()}
+
+@router.get("/trends/top")
+async def get_top_trends(
+    window: str = "7d",
+    platform: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        # trend_store works on a sync Session; run_sync hands it one bound to this connection
+        return await db.run_sync(lambda s: top_trends(s, window=window, platform=platform, limit=limit, cursor=cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/scrape-and-save")
-def scrape_and_save(db: Session = Depends(get_db)):
-    hashtags = fetch_trending_hashtags()
-    for tag in hashtags:
-        db.add(TrendingTopic(platform="Instagram", keyword=tag))
-    db.commit()
+async def scrape_and_save(db: AsyncSession = Depends(get_async_db)):
+    hashtags = await fetch_trending_hashtags_async()
+    await db.run_sync(lambda s: save_trends(s, "Instagram", hashtags))
     return {"saved": hashtags}
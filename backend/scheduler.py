@@ -0,0 +1,201 @@
+"""
+Background pre-warming of trend data.
+
+Periodically scrapes the hashtags we track, seeded from hashtags.csv and
+recent TrendingTopic rows, plus the YouTube searches users ran in the last
+few days. Instagram results refresh the per-hashtag scrape cache and YouTube
+results the page cache, so interactive requests nearly always hit warm data.
+Everything scraped is also written to the trend store.
+
+    python -m backend.scheduler --interval 1800 --once
+"""
+import argparse
+import csv
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from backend.scraping import scrape
+
+PLATFORMS = {"instagram": "Instagram", "youtube": "YouTube", "fake": "Fake"}
+# Refreshing a scrape cache means bypassing its read path.
+# Pre-warm searches must not count as user searches, or they would keep themselves alive.
+REFRESH_OPTIONS = {"instagram": {"use_cache": False}, "youtube": {"remember": False}}
+
+
+def seed_from_csv(path="hashtags.csv", limit=100):
+    tags = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if row and row[0].strip():
+                tags.append(row[0].strip())
+    return list(dict.fromkeys(tags))[:limit]
+
+
+def seed_from_recent_queries(limit=20):
+    from backend.scraping.youtube_scraper import recent_queries
+    return recent_queries(limit)
+
+
+def seed_from_db(db, platform="Instagram", days=7, limit=100):
+    from backend.models import TrendingTopic
+    since = datetime.utcnow() - timedelta(days=days)
+    rows = (db.query(TrendingTopic.keyword)
+            .filter(TrendingTopic.platform == platform, TrendingTopic.timestamp >= since)
+            .distinct().limit(limit).all())
+    return [row[0] for row in rows]
+
+
+def batched(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def write_to_trend_store(source, query, result):
+    from backend.database import SessionLocal
+    from backend.trend_store import save_trends
+    # YouTube results are video dicts; store their hashtags like the Instagram ones.
+    if isinstance(result[0], dict):
+        keywords = sorted({tag for r in result for tag in r.get("hashtags", [])})
+    else:
+        keywords = list(result)
+    db = SessionLocal()
+    try:
+        save_trends(db, PLATFORMS.get(source, source), keywords)
+    finally:
+        db.close()
+
+
+class TrendPrewarmer:
+    def __init__(self, jobs, interval=1800.0, jitter=0.1, max_concurrency=2, on_result=write_to_trend_store,
+                 maintenance=None):
+        """
+        jobs: list of (source_name, query) pairs, or a callable returning one,
+              re-evaluated every cycle.
+        jitter: fraction of the interval added or removed at random each cycle.
+        maintenance: optional callable run after each cycle (e.g. trend retention).
+        """
+        self._jobs = jobs if callable(jobs) else list(jobs)
+        self.maintenance = maintenance
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.on_result = on_result
+        self.runs = 0
+        self.failures = 0
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def jobs(self):
+        return self._jobs() if callable(self._jobs) else self._jobs
+
+    def _run_job(self, job):
+        source, query = job
+        try:
+            result = scrape(source, query, **REFRESH_OPTIONS.get(source, {}))
+            if self.on_result is not None and result:
+                self.on_result(source, query, result)
+            return True
+        except Exception as e:
+            print(f"Pre-warm of {source} {query!r} failed: {e}")
+            return False
+
+    def run_once(self):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            results = list(pool.map(self._run_job, self.jobs))
+        self.runs += 1
+        self.failures += results.count(False)
+        if self.maintenance is not None:
+            try:
+                self.maintenance()
+            except Exception as e:
+                print(f"Pre-warm maintenance failed: {e}")
+        self.last_run = time.perf_counter() - start
+        return results
+
+    def next_delay(self):
+        return max(0.0, self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.next_delay())
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="trend-prewarmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def instagram_jobs(csv_path="hashtags.csv", db=None, batch_size=10):
+    tags = seed_from_csv(csv_path)
+    if db is not None:
+        tags = list(dict.fromkeys(tags + seed_from_db(db)))
+    return [("instagram", batch) for batch in batched(tags, batch_size)]
+
+
+def youtube_jobs(limit=20):
+    return [("youtube", query) for query in seed_from_recent_queries(limit)]
+
+
+def default_jobs(csv_path="hashtags.csv", db=None, batch_size=10):
+    return instagram_jobs(csv_path, db, batch_size) + youtube_jobs()
+
+
+def compact_trend_store():
+    from backend.database import SessionLocal
+    from backend.trend_store import compact_trends
+    db = SessionLocal()
+    try:
+        return compact_trends(db)
+    finally:
+        db.close()
+
+
+def build_default_prewarmer(interval=1800.0, jitter=0.1, max_concurrency=2):
+    from backend.database import SessionLocal
+    db = SessionLocal()
+    try:
+        tag_jobs = instagram_jobs(db=db)
+    finally:
+        db.close()
+    # YouTube queries are re-read each cycle so searches made since startup get warmed too
+    return TrendPrewarmer(lambda: tag_jobs + youtube_jobs(), interval=interval, jitter=jitter, max_concurrency=max_concurrency,
+                          maintenance=compact_trend_store)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interval", type=float, default=1800.0)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--once", action="store_true")
+    parser.add_argument("--fake", action="store_true", help="use the offline fake source and skip the database")
+    args = parser.parse_args()
+
+    if args.fake:
+        jobs = [("fake", batch) for batch in batched(seed_from_csv(), 10)]
+        prewarmer = TrendPrewarmer(jobs, args.interval, args.jitter, args.concurrency,
+                                   on_result=lambda source, query, result: print(source, query, "->", len(result)))
+    else:
+        prewarmer = build_default_prewarmer(args.interval, args.jitter, args.concurrency)
+    if args.once:
+        prewarmer.run_once()
+        print(f"Pre-warmed {len(prewarmer.jobs)} jobs in {prewarmer.last_run:.2f}s ({prewarmer.failures} failed)")
+    else:
+        prewarmer.start()
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            prewarmer.stop()
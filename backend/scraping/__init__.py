@@ -0,0 +1,6 @@
+from backend.scraping.best_hashtags import fetch_trending_hashtags_async
+from backend.scraping.registry import TrendSource, available_sources, get_source, register_source, scrape
+
+
+def fetch_trending_hashtags():
+    return scrape("best_hashtags")
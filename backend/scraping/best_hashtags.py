@@ -0,0 +1,24 @@
+from bs4 import BeautifulSoup
+from backend.scraping import http
+
+URL = "https://best-hashtags.com/hashtag/trending/"
+
+
+def parse_trending_hashtags(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [tag.text for tag in soup.find_all("a", class_="trend-name")][:10]
+
+
+async def fetch_trending_hashtags_async():
+    response = await http.arequest("best_hashtags", "GET", URL)
+    return parse_trending_hashtags(response.text)
+
+
+def fetch_trending_hashtags():
+    response = http.request("best_hashtags", "GET", URL)
+    hashtags = parse_trending_hashtags(response.text)
+
+    # Print hashtags in the terminal
+    print("Trending Hashtags:", hashtags)
+
+    return hashtags
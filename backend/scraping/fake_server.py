@@ -0,0 +1,136 @@
+"""
+Local stand-in for the Apify and YouTube Data APIs, for offline benchmarks.
+
+    server, base_url = serve(apify_delay=1.5, youtube_delay=0.8)
+    instagram_scraper.APIFY_BASE_URL = base_url
+    youtube_scraper.YOUTUBE_API_URL = base_url + "/youtube/v3"
+
+or run it standalone and point APIFY_BASE_URL / YOUTUBE_API_URL at it:
+
+    python -m backend.scraping.fake_server --port 8765
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def fake_posts(hashtags, per_tag=2):
+    posts = []
+    for tag in hashtags:
+        tag = tag.lstrip("#")
+        for i in range(per_tag):
+            posts.append({
+                "caption": f"Post {i} about #{tag} #{tag}life #students",
+                "firstComment": f"#{tag}{i} love it",
+                "latestComments": [{"text": "#campus #club"}],
+            })
+    return posts
+
+
+def fake_videos(query, count=10):
+    words = [w for w in query.split() if w.isalnum()][:3] or ["event"]
+    return [{
+        "id": {"videoId": f"vid{i:04d}"},
+        "snippet": {"title": f"{' '.join(words)} short #{i}",
+                    "description": " ".join(f"#{w.lower()}" for w in words) + " #shorts"},
+    } for i in range(count)]
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    apify_delay = 0.0
+    youtube_delay = 0.0
+    runs = {}
+    _run_ids = itertools.count(1)
+
+    def _send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if path.startswith("/v2/acts/") and path.endswith("/run-sync-get-dataset-items"):
+            time.sleep(self.apify_delay)
+            self._send_json(fake_posts(payload.get("hashtags", []), payload.get("resultsLimit", 2)))
+        elif path.startswith("/v2/acts/") and path.endswith("/runs"):
+            run_id = f"run{next(self._run_ids)}"
+            self.runs[run_id] = {
+                "items": fake_posts(payload.get("hashtags", []), payload.get("resultsLimit", 2)),
+                "started": time.monotonic(),
+            }
+            self._send_json({"data": {"id": run_id, "defaultDatasetId": run_id, "status": "RUNNING"}}, 201)
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def _visible_items(self, run):
+        # Items "appear" linearly over apify_delay seconds, like a running actor pushing results.
+        elapsed = time.monotonic() - run["started"]
+        if not self.apify_delay or elapsed >= self.apify_delay:
+            return run["items"], True
+        return run["items"][:int(len(run["items"]) * elapsed / self.apify_delay)], False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = url.path.strip("/").split("/")
+        if url.path.startswith("/v2/actor-runs/") and parts[-1] in self.runs:
+            _, done = self._visible_items(self.runs[parts[-1]])
+            self._send_json({"data": {"id": parts[-1], "status": "SUCCEEDED" if done else "RUNNING"}})
+        elif url.path.startswith("/v2/datasets/") and parts[-1] == "items" and parts[-2] in self.runs:
+            items, _ = self._visible_items(self.runs[parts[-2]])
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(len(items))])[0])
+            self._send_json(items[offset:offset + limit])
+        elif url.path == "/youtube/v3/search":
+            time.sleep(self.youtube_delay)
+            count = int(query.get("maxResults", ["10"])[0])
+            page = int(query.get("pageToken", ["p0"])[0][1:])
+            videos = fake_videos(query.get("q", [""])[0], count * (page + 1))[count * page:]
+            body = {"items": videos, "nextPageToken": f"p{page + 1}"}
+            etag = hashlib.md5(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self._send_json({**body, "etag": etag}, headers={"ETag": etag})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host="127.0.0.1", port=0, apify_delay=0.0, youtube_delay=0.0):
+    """Start the fake API in a daemon thread; returns (server, base_url)."""
+    handler = type("ConfiguredFakeAPIHandler", (FakeAPIHandler,),
+                   {"apify_delay": apify_delay, "youtube_delay": youtube_delay})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--apify-delay", type=float, default=1.5)
+    parser.add_argument("--youtube-delay", type=float, default=0.8)
+    args = parser.parse_args()
+    server, url = serve(port=args.port, apify_delay=args.apify_delay, youtube_delay=args.youtube_delay)
+    print(f"Fake Apify/YouTube API on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
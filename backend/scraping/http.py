@@ -0,0 +1,105 @@
+"""
+Shared HTTP clients for all scrapers: one keep-alive connection pool (plus an
+httpx pool for async callers), retries with exponential backoff, and a
+token-bucket rate limit per source.
+"""
+import asyncio
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session = None
+_session_lock = threading.Lock()
+_async_client = None
+_limiters = {}
+
+
+def _build_session():
+    # Status retries only apply to idempotent methods; POSTs are retried on connection errors only.
+    retry = Retry(total=3, connect=3, read=2, backoff_factor=0.5,
+                  status_forcelist=(429, 500, 502, 503, 504), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def get_async_client():
+    """Process-wide httpx.AsyncClient; call aclose_async_client() on shutdown."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        import httpx
+        transport = httpx.AsyncHTTPTransport(retries=3)
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        _async_client = httpx.AsyncClient(transport=transport, limits=limits, timeout=30, follow_redirects=True)
+    return _async_client
+
+
+async def aclose_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+class RateLimiter:
+    """Token bucket: `rate` requests per second with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        """Take a token if one is available; otherwise return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+
+def set_rate_limit(source, rate, burst=1):
+    _limiters[source] = RateLimiter(rate, burst)
+
+
+def request(source, method, url, **kwargs):
+    """Send a request through the shared pool after taking a token from the source's limiter."""
+    limiter = _limiters.get(source)
+    if limiter is not None:
+        limiter.acquire()
+    kwargs.setdefault("timeout", 30)
+    return get_session().request(method, url, **kwargs)
+
+
+async def arequest(source, method, url, **kwargs):
+    """Async counterpart of request() on the shared httpx pool."""
+    limiter = _limiters.get(source)
+    if limiter is not None:
+        await limiter.acquire_async()
+    return await get_async_client().request(method, url, **kwargs)
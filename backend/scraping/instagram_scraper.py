@@ -1,30 +1,164 @@
-import requests
 import re
 import os
+import time
 from dotenv import load_dotenv
+from backend.cache import SQLiteCache
+from backend.scraping import http
+from backend.scraping.jsonstream import iter_json_array
 
 load_dotenv()
 API_KEY = os.getenv("APIFY_API_KEY")
+APIFY_BASE_URL = os.getenv("APIFY_BASE_URL", "https://api.apify.com")
+SCRAPE_CACHE_PATH = os.getenv("SCRAPE_CACHE_PATH", "storage/scrape_cache.sqlite3")
+INSTAGRAM_CACHE_TTL = int(os.getenv("INSTAGRAM_CACHE_TTL", 6 * 3600))
+ACTOR = "apify~instagram-hashtag-scraper"
+# Above this many results per tag the actor is started asynchronously and its dataset paged.
+SYNC_RESULTS_LIMIT = 20
+DATASET_PAGE_SIZE = 100
+DATASET_FIELDS = "caption,firstComment,latestComments,inputUrl,hashtags"
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+HASHTAG_RE = re.compile(r"#\w+")
 
-def scrape_instagram(hashtags):
-    if not hashtags:
-        return []
-    payload = {"hashtags": hashtags, "resultsLimit": 2}
-    url = f"https://api.apify.com/v2/acts/apify~instagram-hashtag-scraper/run-sync-get-dataset-items?token={API_KEY}"
-    headers = {"Content-Type": "application/json"}
+_hashtag_cache = None
+_api_calls = 0
+
+
+def get_hashtag_cache():
+    """Persistent per-hashtag cache of extracted tags, created on first use."""
+    global _hashtag_cache
+    if _hashtag_cache is None:
+        _hashtag_cache = SQLiteCache(SCRAPE_CACHE_PATH, table="instagram_hashtags", ttl=INSTAGRAM_CACHE_TTL)
+    return _hashtag_cache
+
+
+def cache_stats():
+    return {**get_hashtag_cache().stats(), "apify_calls": _api_calls}
+
+
+def normalize_hashtag(tag):
+    return re.sub(r"\W", "", tag).lower()
+
+
+def _post_hashtags(post):
+    # One pass of the precompiled pattern over all text fields of the post.
+    texts = [post.get("caption") or "", post.get("firstComment") or ""]
+    texts.extend(c.get("text") or "" for c in post.get("latestComments") or [])
+    return set(HASHTAG_RE.findall("\n".join(texts)))
+
+
+def _source_tags(post, requested, extracted):
+    """Which of the requested hashtags a dataset item was scraped for; empty if that can't be told."""
+    input_url = post.get("inputUrl") or ""
+    if input_url:
+        tag = normalize_hashtag(input_url.rstrip("/").rsplit("/", 1)[-1])
+        if tag in requested:
+            return {tag}
+    present = {normalize_hashtag(t) for t in post.get("hashtags", [])} | {normalize_hashtag(t) for t in extracted}
+    return requested & present
+
+
+def _stream_items(response):
+    response.raise_for_status()
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        def find_hashtags(text):
-            return set(re.findall(r"#\w+", text)) if text else set()
-        extracted = set()
-        for post in data:
-            extracted |= find_hashtags(post.get("caption", ""))
-            extracted |= find_hashtags(post.get("firstComment", ""))
-            for c in post.get("latestComments", []):
-                extracted |= find_hashtags(c.get("text", ""))
+        yield from iter_json_array(response.iter_content(chunk_size=64 * 1024))
+    finally:
+        response.close()
+
+
+def _fetch_posts_sync(hashtags, results_limit):
+    global _api_calls
+    payload = {"hashtags": hashtags, "resultsLimit": results_limit}
+    url = f"{APIFY_BASE_URL}/v2/acts/{ACTOR}/run-sync-get-dataset-items?token={API_KEY}"
+    headers = {"Content-Type": "application/json"}
+    _api_calls += 1
+    response = http.request("instagram", "POST", url, json=payload, headers=headers, timeout=30, stream=True)
+    yield from _stream_items(response)
+
+
+def _fetch_dataset_page(dataset_id, offset):
+    # No clean=true: it drops empty items from a page, which would make a short page look
+    # like the end of the dataset and throw the offset off. Empty items are skipped by the caller.
+    params = {"token": API_KEY, "offset": offset, "limit": DATASET_PAGE_SIZE,
+              "format": "json", "fields": DATASET_FIELDS}
+    response = http.request("instagram", "GET", f"{APIFY_BASE_URL}/v2/datasets/{dataset_id}/items",
+                            params=params, timeout=60, stream=True)
+    return _stream_items(response)
+
+
+def _fetch_posts_async(hashtags, results_limit, poll_interval=2.0, timeout=600):
+    """
+    Start the actor, then page through its dataset while it runs, so items
+    are parsed as they are produced instead of after the whole run.
+    """
+    global _api_calls
+    _api_calls += 1
+    response = http.request("instagram", "POST", f"{APIFY_BASE_URL}/v2/acts/{ACTOR}/runs",
+                            params={"token": API_KEY},
+                            json={"hashtags": hashtags, "resultsLimit": results_limit})
+    response.raise_for_status()
+    run = response.json()["data"]
+    deadline = time.monotonic() + timeout
+    offset = 0
+    while True:
+        status = http.request("instagram", "GET", f"{APIFY_BASE_URL}/v2/actor-runs/{run['id']}",
+                              params={"token": API_KEY}).json()["data"]["status"]
+        finished = status in TERMINAL_STATUSES
+        while True:
+            count = 0
+            for item in _fetch_dataset_page(run["defaultDatasetId"], offset):
+                count += 1
+                if item:
+                    yield item
+            offset += count
+            if count < DATASET_PAGE_SIZE:
+                break
+        if finished:
+            if status != "SUCCEEDED":
+                print(f"Apify run {run['id']} ended with status {status}")
+            return
+        if time.monotonic() > deadline:
+            print(f"Apify run {run['id']} still {status} after {timeout}s; using partial results")
+            return
+        time.sleep(poll_interval)
+
+
+def _fetch_posts(hashtags, results_limit=2):
+    if results_limit > SYNC_RESULTS_LIMIT:
+        return _fetch_posts_async(hashtags, results_limit)
+    return _fetch_posts_sync(hashtags, results_limit)
+
+
+def scrape_instagram(hashtags, use_cache=True, results_limit=2):
+    """
+    Hashtags found on recent posts for the given topics. Each input hashtag
+    that comes back with posts is cached for INSTAGRAM_CACHE_TTL seconds; only
+    cache misses are sent to Apify and the results are merged with the cached
+    ones. Posts are
+    parsed one at a time as the response streams in; large results_limit
+    values switch to an asynchronous actor run with paged dataset reads.
+    """
+    tags = list(dict.fromkeys(t for t in (normalize_hashtag(h) for h in hashtags) if t))
+    if not tags:
+        return []
+    cache = get_hashtag_cache()
+    cached = cache.get_many(tags) if use_cache else {}
+    extracted = set()
+    for found in cached.values():
+        extracted.update(found)
+    misses = [t for t in tags if t not in cached]
+    if not misses:
         return sorted(extracted)
+    try:
+        # Only tags that were credited with at least one post get cached; a partial or empty
+        # response must not pin an empty result for the whole TTL. Unattributable posts are dropped.
+        per_tag = {}
+        for post in _fetch_posts(misses, results_limit):
+            found = _post_hashtags(post)
+            for tag in _source_tags(post, set(misses), found):
+                per_tag.setdefault(tag, set()).update(found)
+        for tag, found in per_tag.items():
+            cache.set(tag, sorted(found))
+            extracted |= found
     except Exception as e:
         print(f"Instagram scraper error: {e}")
-        return []
+    return sorted(extracted)
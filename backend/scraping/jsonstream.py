@@ -0,0 +1,44 @@
+"""
+Incremental parsing of a top-level JSON array from a byte stream, so large
+API responses can be processed item by item while they download.
+"""
+import codecs
+import json
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(chunks):
+    """
+    Yield the elements of a JSON array whose bytes arrive in `chunks`.
+    Elements are decoded as soon as they are complete; only the unparsed
+    tail of the stream is kept in memory. Intended for arrays of objects,
+    which (unlike bare numbers) cannot be cut short at a chunk boundary.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    started = False
+    for chunk in chunks:
+        buf += text.decode(chunk) if isinstance(chunk, bytes) else chunk
+        pos = 0
+        while True:
+            while pos < len(buf) and (buf[pos] in _WHITESPACE or (started and buf[pos] == ",")):
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"Expected a JSON array, got {buf[pos:pos + 20]!r}")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break
+            yield item
+        buf = buf[pos:]
+    raise ValueError("Truncated JSON array")
@@ -0,0 +1,95 @@
+"""
+Registry of trend sources. Every source fetches through the shared pooled
+HTTP client in backend.scraping.http and gets its own rate limit.
+
+New sources subclass TrendSource and call register_source().
+"""
+import time
+
+from backend.scraping import http
+
+
+class TrendSource:
+    name = None
+    rate_per_sec = 1.0
+    burst = 1
+
+    def fetch(self, query, **options):
+        raise NotImplementedError
+
+
+class InstagramSource(TrendSource):
+    """query: list of topics/hashtags -> sorted list of hashtags."""
+    name = "instagram"
+    rate_per_sec = 0.5
+    burst = 2
+
+    def fetch(self, query, **options):
+        from backend.scraping.instagram_scraper import scrape_instagram
+        return scrape_instagram(query, **options)
+
+
+class YouTubeSource(TrendSource):
+    """query: event description -> list of {title, hashtags, video_url}."""
+    name = "youtube"
+    rate_per_sec = 5.0
+    burst = 5
+
+    def fetch(self, query, **options):
+        from backend.scraping.youtube_scraper import get_trending_reels
+        return get_trending_reels(query, **options)
+
+
+class BestHashtagsSource(TrendSource):
+    """Site-wide trending hashtags from best-hashtags.com; query is ignored."""
+    name = "best_hashtags"
+    rate_per_sec = 0.2
+
+    def fetch(self, query=None, **options):
+        from backend.scraping.best_hashtags import fetch_trending_hashtags
+        return fetch_trending_hashtags()
+
+
+class FakeSource(TrendSource):
+    """Offline source for tests and the scheduler: deterministic hashtags per query."""
+    name = "fake"
+    rate_per_sec = 100.0
+    burst = 100
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def fetch(self, query, **options):
+        self.calls += 1
+        time.sleep(self.delay)
+        topics = query if isinstance(query, (list, tuple)) else [query or "trending"]
+        return sorted({f"#{str(t).lstrip('#').lower()}{suffix}" for t in topics for suffix in ("", "life", "2026")})
+
+
+_sources = {}
+
+
+def register_source(source):
+    _sources[source.name] = source
+    http.set_rate_limit(source.name, source.rate_per_sec, source.burst)
+    return source
+
+
+def get_source(name):
+    try:
+        return _sources[name]
+    except KeyError:
+        raise KeyError(f"Unknown trend source {name!r}; registered: {sorted(_sources)}") from None
+
+
+def available_sources():
+    return sorted(_sources)
+
+
+def scrape(name, query=None, **options):
+    return get_source(name).fetch(query, **options)
+
+
+for _source in (InstagramSource(), YouTubeSource(), BestHashtagsSource(), FakeSource()):
+    register_source(_source)
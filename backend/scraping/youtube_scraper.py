@@ -1,38 +1,156 @@
-import requests
+import hashlib
+import json
+import math
 import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from backend.cache import SQLiteCache
+from backend.scraping import http
 
 load_dotenv()
 API_KEY = os.getenv("YOUTUBE_API_KEY")
+YOUTUBE_API_URL = os.getenv("YOUTUBE_API_URL", "https://www.googleapis.com/youtube/v3")
+SCRAPE_CACHE_PATH = os.getenv("SCRAPE_CACHE_PATH", "storage/scrape_cache.sqlite3")
+# Pages younger than this are served from cache without a request; older ones are revalidated by ETag.
+YOUTUBE_FRESH_SECONDS = int(os.getenv("YOUTUBE_FRESH_SECONDS", 15 * 60))
+YOUTUBE_CACHE_TTL = 7 * 24 * 3600
+# Interactive queries are remembered this long so the pre-warmer can keep their pages fresh.
+RECENT_QUERY_TTL = 3 * 24 * 3600
+# Partial response: only the fields get_trending_reels parses.
+SEARCH_FIELDS = "etag,nextPageToken,items(id/videoId,snippet(title,description))"
+SEARCH_QUOTA_COST = 100
+MAX_PAGE_SIZE = 50
 
-def get_trending_reels(event_description):
-    search_query = event_description + " trending shorts"
+_page_cache = None
+_recent_queries = None
+_quota = Counter()
+_counters = Counter()
+_stats_lock = threading.Lock()
+_page_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="youtube-pages")
+
+
+def get_page_cache():
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = SQLiteCache(SCRAPE_CACHE_PATH, table="youtube_pages", ttl=YOUTUBE_CACHE_TTL)
+    return _page_cache
+
+
+def get_recent_query_cache():
+    global _recent_queries
+    if _recent_queries is None:
+        _recent_queries = SQLiteCache(SCRAPE_CACHE_PATH, table="youtube_recent_queries", ttl=RECENT_QUERY_TTL,
+                                      max_entries=200)
+    return _recent_queries
+
+
+def recent_queries(limit=20):
+    """Event descriptions users searched for recently, newest first."""
+    return get_recent_query_cache().recent(limit)
+
+
+def quota_usage():
+    """Quota units spent per search query, plus request/cache counters."""
+    with _stats_lock:
+        return {"total_units": sum(_quota.values()), "per_query": dict(_quota), **_counters}
+
+
+def _page_params(search_query, page_size, page_token):
     params = {
         "part": "snippet",
         "q": search_query,
         "type": "video",
         "videoDuration": "short",
-        "maxResults": 10,
-        "key": API_KEY
+        "maxResults": page_size,
+        "fields": SEARCH_FIELDS,
     }
+    if page_token:
+        params["pageToken"] = page_token
+    return params
+
+
+def _cache_key(params):
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _cached_page(search_query, page_size, page_token):
+    return get_page_cache().get(_cache_key(_page_params(search_query, page_size, page_token)))
+
+
+def _fetch_page(search_query, page_size, page_token=None):
+    params = _page_params(search_query, page_size, page_token)
+    key = _cache_key(params)
+    cache = get_page_cache()
+    cached = cache.get(key)
+    if cached and time.time() - cached["fetched"] < YOUTUBE_FRESH_SECONDS:
+        with _stats_lock:
+            _counters["fresh_hits"] += 1
+        return cached["body"]
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    response = http.request("youtube", "GET", f"{YOUTUBE_API_URL}/search", params={**params, "key": API_KEY},
+                            headers=headers, timeout=15)
+    with _stats_lock:
+        _quota[search_query] += SEARCH_QUOTA_COST
+        _counters["requests"] += 1
+    if response.status_code == 304 and cached:
+        with _stats_lock:
+            _counters["not_modified"] += 1
+        body = cached["body"]
+    else:
+        response.raise_for_status()
+        body = response.json()
+    cache.set(key, {"etag": response.headers.get("ETag") or body.get("etag"), "body": body,
+                    "fetched": time.time()})
+    return body
+
+
+def _fetch_pages(search_query, page_size, pages):
+    """
+    Page tokens form a chain, so unknown pages must be walked in order. Pages
+    whose tokens are already known from cached earlier pages are fetched
+    (revalidated) concurrently.
+    """
+    bodies = [_fetch_page(search_query, page_size)]
+    while len(bodies) < pages and bodies[-1].get("nextPageToken"):
+        tokens = []
+        token = bodies[-1]["nextPageToken"]
+        while token and len(bodies) + len(tokens) < pages:
+            tokens.append(token)
+            cached = _cached_page(search_query, page_size, token)
+            token = cached["body"].get("nextPageToken") if cached else None
+        bodies.extend(_page_pool.map(lambda t: _fetch_page(search_query, page_size, t), tokens))
+    return bodies
+
+
+def get_trending_reels(event_description, max_results=10, remember=True):
+    search_query = event_description + " trending shorts"
     try:
-        response = requests.get("https://www.googleapis.com/youtube/v3/search", params=params)
-        data = response.json()
-        if "items" not in data:
-            return []
+        if remember and max_results == 10:
+            # Only default-sized searches are replayed, so the pre-warmer hits the same page keys
+            get_recent_query_cache().set(event_description, event_description)
+        page_size = min(max_results, MAX_PAGE_SIZE)
+        pages = math.ceil(max_results / MAX_PAGE_SIZE)
         trending_ideas = []
-        for item in data["items"]:
-            title = item["snippet"]["title"]
-            description = item["snippet"].get("description", "")
-            video_id = item["id"]["videoId"]
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            hashtags = [w for w in description.split() if w.startswith("#")]
-            trending_ideas.append({
-                "title": title,
-                "hashtags": hashtags,
-                "video_url": video_url
-            })
-        return trending_ideas
+        seen = set()
+        for data in _fetch_pages(search_query, page_size, pages):
+            for item in data.get("items", []):
+                video_id = item["id"]["videoId"]
+                if video_id in seen:
+                    continue
+                seen.add(video_id)
+                title = item["snippet"]["title"]
+                description = item["snippet"].get("description", "")
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
+                hashtags = [w for w in description.split() if w.startswith("#")]
+                trending_ideas.append({
+                    "title": title,
+                    "hashtags": hashtags,
+                    "video_url": video_url
+                })
+        return trending_ideas[:max_results]
     except Exception as e:
         print(f"YouTube scraper error: {e}")
         return []
@@ -0,0 +1,79 @@
+"""
+Semantic cache of LLM generations keyed on the event description.
+
+Near-duplicate events (the weekly hack night where only the date changes)
+reuse an earlier generation: the cached text is adapted by swapping the old
+event's name, date, time and venue for the new ones.
+"""
+import threading
+import time
+
+import numpy as np
+
+ADAPTED_FIELDS = ("name", "date", "time", "venue")
+
+
+def event_text(event):
+    return f"{event.get('name', '')}. {event.get('about', '')}"
+
+
+def adapt_text(text, cached_event, event):
+    for field in ADAPTED_FIELDS:
+        old, new = str(cached_event.get(field) or ""), str(event.get(field) or "")
+        if old and new and old != new:
+            text = text.replace(old, new)
+    return text
+
+
+class SemanticCache:
+    def __init__(self, embed, threshold=0.92, max_entries=500):
+        """`embed` maps a list of strings to a 2-D float array."""
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.entries = []
+        self.vectors = None
+        self.lookups = 0
+        self.hits = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+
+    def _vector(self, event):
+        vec = np.asarray(self.embed([event_text(event)]), dtype='float32')[0]
+        return vec / (np.linalg.norm(vec) or 1.0)
+
+    def lookup(self, event):
+        """Return (adapted_text, similarity) for the closest cached event above threshold, else None."""
+        start = time.perf_counter()
+        vec = self._vector(event)
+        with self._lock:
+            self.lookups += 1
+            if self.vectors is None or not len(self.entries):
+                return None
+            sims = self.vectors @ vec
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            entry = self.entries[best]
+            self.hits += 1
+            self.seconds_saved += max(0.0, entry["seconds"] - (time.perf_counter() - start))
+        return adapt_text(entry["text"], entry["event"], event), float(sims[best])
+
+    def add(self, event, text, seconds):
+        """Remember a generation and how long it took to produce."""
+        vec = self._vector(event)
+        with self._lock:
+            self.entries.append({"event": dict(event), "text": text, "seconds": seconds})
+            self.vectors = vec[None, :] if self.vectors is None else np.vstack([self.vectors, vec])
+            if len(self.entries) > self.max_entries:
+                self.entries = self.entries[1:]
+                self.vectors = self.vectors[1:]
+
+    def stats(self):
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_ratio": self.hits / self.lookups if self.lookups else 0.0,
+            "seconds_saved": round(self.seconds_saved, 3),
+            "size": len(self.entries),
+        }
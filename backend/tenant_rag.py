@@ -0,0 +1,97 @@
+"""
+Multi-tenant front end for CompanyRAG.
+
+All clubs share one embedding model (through backend.registry). Each club has
+its own on-disk snapshot shard that is loaded on first request and evicted,
+least recently used first, once resident shards exceed the memory budget.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from backend.registry import DEFAULT_EMBEDDING_MODEL
+from backend.updated_company_rag import CompanyRAG
+
+_TENANT_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class TenantRAGManager:
+    def __init__(self, clubs_dir="data/clubs", shard_dir="storage/shards", memory_budget_mb=512,
+                 model_name=DEFAULT_EMBEDDING_MODEL, index_type="auto", tenant_json=None):
+        self.clubs_dir = clubs_dir
+        self.shard_dir = shard_dir
+        self.memory_budget = int(memory_budget_mb * 2**20)
+        self.model_name = model_name
+        self.index_type = index_type
+        self.tenant_json = dict(tenant_json or {})
+        self._resident = OrderedDict()
+        self._stats = {}
+        self._lock = threading.RLock()
+
+    def json_path(self, tenant):
+        return self.tenant_json.get(tenant) or os.path.join(self.clubs_dir, f"{tenant}.json")
+
+    def shard_path(self, tenant):
+        return os.path.join(self.shard_dir, tenant, "company_rag.pkl")
+
+    def _tenant_stats(self, tenant):
+        return self._stats.setdefault(tenant, {"hits": 0, "loads": 0, "evictions": 0})
+
+    def get(self, tenant):
+        """Return the tenant's CompanyRAG, loading its shard on first use."""
+        if not _TENANT_RE.fullmatch(tenant):
+            raise ValueError(f"Invalid tenant id: {tenant!r}")
+        with self._lock:
+            stats = self._tenant_stats(tenant)
+            if tenant in self._resident:
+                self._resident.move_to_end(tenant)
+                stats["hits"] += 1
+                return self._resident[tenant]
+            os.makedirs(os.path.dirname(self.shard_path(tenant)), exist_ok=True)
+            rag = CompanyRAG(model_name=self.model_name, json_path=self.json_path(tenant),
+                             snapshot_path=self.shard_path(tenant), index_type=self.index_type)
+            stats["loads"] += 1
+            self._resident[tenant] = rag
+            self._enforce_budget(keep=tenant)
+            return rag
+
+    def search(self, tenant, query, k=3):
+        return self.get(tenant).search(query, k)
+
+    def search_many(self, tenant, queries, k=3):
+        return self.get(tenant).search_many(queries, k)
+
+    def memory_usage(self):
+        with self._lock:
+            return sum(rag.memory_usage() for rag in self._resident.values())
+
+    def evict(self, tenant):
+        """Persist the tenant's shard and drop it from memory."""
+        with self._lock:
+            rag = self._resident.pop(tenant, None)
+            if rag is None:
+                return False
+            rag.save_to_disk(self.shard_path(tenant))
+            self._tenant_stats(tenant)["evictions"] += 1
+            return True
+
+    def _enforce_budget(self, keep):
+        while len(self._resident) > 1 and self.memory_usage() > self.memory_budget:
+            oldest = next(iter(self._resident))
+            if oldest == keep:
+                break
+            self.evict(oldest)
+
+    def stats(self, tenant=None):
+        with self._lock:
+            tenants = [tenant] if tenant else sorted(self._stats)
+            report = {}
+            for name in tenants:
+                entry = dict(self._tenant_stats(name))
+                rag = self._resident.get(name)
+                entry["resident"] = rag is not None
+                entry["memory_bytes"] = rag.memory_usage() if rag else 0
+                entry["query_cache"] = rag.query_cache.stats() if rag else None
+                report[name] = entry
+            return report[tenant] if tenant else report
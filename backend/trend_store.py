@@ -0,0 +1,191 @@
+"""
+Persistence and aggregation of scraped trends.
+
+Ingestion is a single bulk upsert per batch: rows are deduplicated on
+(platform, normalized keyword, hourly time bucket) and repeats increment
+`count` instead of adding rows. The same batch is folded into hourly and
+daily rollup tables, which serve top-N queries and outlive raw rows once
+the retention policy compacts them.
+"""
+import base64
+import json
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_
+
+from backend.models import TrendingTopic, TrendRollupDaily, TrendRollupHourly
+
+TREND_BUCKET = timedelta(hours=1)
+UPSERT_BATCH_SIZE = 1000
+# Windows up to this long are answered from hourly rollups, longer ones from daily.
+HOURLY_WINDOW_LIMIT = timedelta(hours=48)
+RAW_RETENTION = timedelta(days=7)
+HOURLY_RETENTION = timedelta(days=30)
+# Longest window top_trends accepts; anything larger is rejected as invalid.
+MAX_WINDOW = timedelta(days=3650)
+
+
+def normalize_keyword(keyword):
+    return keyword.strip().lstrip("#").lower()
+
+
+def bucket_start(ts, size=TREND_BUCKET):
+    epoch = datetime(1970, 1, 1)
+    return epoch + ((ts - epoch) // size) * size
+
+
+def _insert_for(db):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Trend upserts are not implemented for {dialect}")
+    return insert
+
+
+def trend_rows(platform, keywords, now=None):
+    """Deduplicated row dicts for one ingestion batch."""
+    now = now or datetime.utcnow()
+    bucket = bucket_start(now)
+    rows = {}
+    for keyword in keywords:
+        normalized = normalize_keyword(keyword) if keyword else ""
+        if not normalized:
+            continue
+        if normalized in rows:
+            rows[normalized]["count"] += 1
+        else:
+            rows[normalized] = {"platform": platform, "keyword": keyword.strip(), "normalized_keyword": normalized,
+                                "time_bucket": bucket, "count": 1, "timestamp": now}
+    return list(rows.values())
+
+
+def _upsert(db, insert, model, rows, conflict_cols, set_):
+    stmt = insert(model)
+    stmt = stmt.on_conflict_do_update(index_elements=conflict_cols, set_=set_(stmt))
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        db.execute(stmt, rows[i:i + UPSERT_BATCH_SIZE])
+
+
+def _rollup_rows(rows, size):
+    merged = {}
+    for row in rows:
+        bucket = bucket_start(row["timestamp"], size)
+        key = (row["platform"], row["normalized_keyword"], bucket)
+        if key in merged:
+            merged[key]["count"] += row["count"]
+        else:
+            merged[key] = {"platform": row["platform"], "normalized_keyword": row["normalized_keyword"],
+                           "keyword": row["keyword"], "bucket_start": bucket, "count": row["count"]}
+    return list(merged.values())
+
+
+def _fold_into_rollups(db, insert, rows):
+    conflict = ["platform", "normalized_keyword", "bucket_start"]
+    for model, size in ((TrendRollupHourly, timedelta(hours=1)), (TrendRollupDaily, timedelta(days=1))):
+        _upsert(db, insert, model, _rollup_rows(rows, size), conflict,
+                lambda stmt, model=model: {"count": model.count + stmt.excluded.count})
+
+
+def save_trends(db, platform, keywords, now=None):
+    """Bulk-upsert keywords for `platform`; returns the number of distinct keywords written."""
+    rows = trend_rows(platform, keywords, now)
+    if not rows:
+        return 0
+    insert = _insert_for(db)
+    _upsert(db, insert, TrendingTopic, rows, ["platform", "normalized_keyword", "time_bucket"],
+            lambda stmt: {"count": TrendingTopic.count + stmt.excluded.count, "timestamp": stmt.excluded.timestamp})
+    _fold_into_rollups(db, insert, rows)
+    db.commit()
+    return len(rows)
+
+
+def parse_window(window):
+    match = re.fullmatch(r"(\d+)([hd])", window.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid window {window!r}; use e.g. '24h' or '7d'")
+    hours = int(match.group(1)) * (1 if match.group(2) == "h" else 24)
+    if hours > MAX_WINDOW / timedelta(hours=1):
+        raise ValueError(f"Invalid window {window!r}; the longest supported window is {MAX_WINDOW.days}d")
+    return timedelta(hours=hours)
+
+
+def encode_cursor(total, keyword):
+    return base64.urlsafe_b64encode(json.dumps([total, keyword]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        total, keyword = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return int(total), str(keyword)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+
+
+def top_trends(db, window="7d", platform=None, limit=20, cursor=None, now=None):
+    """
+    Top keywords by count over the trailing window, read from the rollups.
+    Pages are keyset-paginated on (count desc, keyword asc).
+    """
+    span = parse_window(window)
+    now = now or datetime.utcnow()
+    model, size = (TrendRollupHourly, timedelta(hours=1)) if span <= HOURLY_WINDOW_LIMIT \
+        else (TrendRollupDaily, timedelta(days=1))
+    since = bucket_start(now - span, size)
+
+    total = func.sum(model.count).label("total")
+    query = db.query(model.normalized_keyword, func.min(model.keyword).label("keyword"), total) \
+        .filter(model.bucket_start >= since)
+    if platform:
+        query = query.filter(model.platform == platform)
+    query = query.group_by(model.normalized_keyword)
+    if cursor:
+        after_total, after_keyword = decode_cursor(cursor)
+        query = query.having(or_(func.sum(model.count) < after_total,
+                                 and_(func.sum(model.count) == after_total,
+                                      model.normalized_keyword > after_keyword)))
+    rows = query.order_by(total.desc(), model.normalized_keyword).limit(limit + 1).all()
+
+    items = [{"keyword": row.keyword, "count": int(row.total)} for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(int(last.total), last.normalized_keyword)
+    return {"window": window, "platform": platform, "items": items, "next_cursor": next_cursor}
+
+
+def compact_trends(db, raw_retention=RAW_RETENTION, hourly_retention=HOURLY_RETENTION, now=None):
+    """
+    Apply the retention policy. Raw rows are already folded into the rollups
+    at ingest time, so compaction only deletes what has aged out: raw rows
+    after raw_retention and hourly rollups after hourly_retention. Daily
+    rollups are kept.
+    """
+    now = now or datetime.utcnow()
+    raw = db.query(TrendingTopic).filter(TrendingTopic.time_bucket < now - raw_retention) \
+        .delete(synchronize_session=False)
+    hourly = db.query(TrendRollupHourly).filter(TrendRollupHourly.bucket_start < now - hourly_retention) \
+        .delete(synchronize_session=False)
+    db.commit()
+    return {"raw_deleted": raw, "hourly_deleted": hourly}
+
+
+def rebuild_rollups(db):
+    """Recompute both rollup tables from the raw rows (for migrating existing data)."""
+    db.query(TrendRollupHourly).delete(synchronize_session=False)
+    db.query(TrendRollupDaily).delete(synchronize_session=False)
+    insert = _insert_for(db)
+    last_id = 0
+    while True:
+        batch = db.query(TrendingTopic).filter(TrendingTopic.id > last_id) \
+            .order_by(TrendingTopic.id).limit(UPSERT_BATCH_SIZE * 10).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        rows = [{"platform": t.platform, "normalized_keyword": t.normalized_keyword, "keyword": t.keyword,
+                 "timestamp": t.time_bucket, "count": t.count} for t in batch]
+        _fold_into_rollups(db, insert, rows)
+    db.commit()
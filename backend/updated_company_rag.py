@@ -1,77 +1,402 @@
+import hashlib
 import json
 import os
+import pickle
+import time
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import faiss
-import google.generativeai as genai
-from dotenv import load_dotenv
+from backend import ann_index
+from backend.bm25 import BM25Index, fuse_scores
+from backend.cache import LRUCache, SQLiteCache, prompt_cache_key
+from backend.registry import DEFAULT_EMBEDDING_MODEL, DEFAULT_LLM_MODEL, get_embedding_model, get_llm
+from backend.semantic_cache import SemanticCache
+
+SNAPSHOT_VERSION = 3
+RETRIEVAL_MODES = ("dense", "hybrid", "keyword")
+# Dense and lexical candidate pools are this many times k before fusion.
+CANDIDATE_FACTOR = 4
+
+
+def _faiss():
+    # faiss is imported on first index operation rather than at module import.
+    import faiss
+    return faiss
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _replace_atomically(path, write):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
 
-load_dotenv()
-GOOGLE_API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel('gemini-2.0-flash-lite')
 
 class CompanyRAG:
-    def __init__(self, model_name="all-MiniLM-L6-v2", json_path="data/company_details.json"):
-        self.embedding_model = SentenceTransformer(model_name)
+    def __init__(self, model_name=DEFAULT_EMBEDDING_MODEL, json_path="data/company_details.json", snapshot_path=None,
+                 llm_model=DEFAULT_LLM_MODEL, query_cache_size=1024, index_type="auto",
+                 retrieval_mode="hybrid", hybrid_alpha=0.5, response_cache_path=None,
+                 response_cache_ttl=7 * 24 * 3600, response_cache_size=2000, semantic_cache_threshold=None):
+        if index_type not in ann_index.INDEX_TYPES:
+            raise ValueError(f"index_type must be one of {ann_index.INDEX_TYPES}")
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"retrieval_mode must be one of {RETRIEVAL_MODES}")
+        self.model_name = model_name
+        self.index_type = index_type
+        self.retrieval_mode = retrieval_mode
+        self.hybrid_alpha = hybrid_alpha
+        self.bm25 = BM25Index()
+        self.keyword_fast_path_hits = 0
+        self.response_cache = SQLiteCache(response_cache_path, table="llm_responses", ttl=response_cache_ttl,
+                                          max_entries=response_cache_size) if response_cache_path else None
+        self.semantic_cache = SemanticCache(self._embed_queries, semantic_cache_threshold) \
+            if semantic_cache_threshold else None
+        self.llm_model = llm_model
+        self.query_cache = LRUCache(query_cache_size)
+        self._embedding_model = None
+        # Content hash -> row in _emb_buffer, so unchanged documents are never re-encoded
+        self._key_to_pos = {}
+        self._doc_keys = []
+        self._source_hash = None
         self.company_info = {}
         self.document_store = []
-        self.index = None  
-        self.embeddings = None  
+        self.index = None
+        self._auto_index_type = None
+        self.embeddings = None
+        self._emb_buffer = None
+        self._id_to_pos = {}
+        self._next_id = 0
+        self._trend_doc_id = None
+        if snapshot_path and os.path.exists(snapshot_path) and self.load_from_disk(snapshot_path) \
+                and self._source_hash == _file_hash(json_path):
+            return
         self.load_company_json(json_path)
+        if snapshot_path:
+            self.save_to_disk(snapshot_path)
+
+    @property
+    def embedding_model(self):
+        # Resolved on first encode so a fully warm snapshot never touches the model.
+        if self._embedding_model is None:
+            self._embedding_model = get_embedding_model(self.model_name)
+        return self._embedding_model
 
     def load_company_json(self, json_path):
         with open(json_path, 'r', encoding='utf-8') as f:
             self.company_info = json.load(f)
+        self._source_hash = _file_hash(json_path)
         self._process_company_info()
+        return True
 
     def _process_company_info(self):
         self.document_store = []
+        self.bm25 = BM25Index()
+        self._next_id = 0
+        self._trend_doc_id = None
         for section, content in self.company_info.items():
             if section == "keywords" and isinstance(content, list):
-                self.document_store.append({
-                    "content": "Company keywords: "+", ".join(content),
-                    "metadata": {"section": section}
-                })
+                self._append_doc("Company keywords: "+", ".join(content), {"section": section})
             elif isinstance(content, str):
                 for paragraph in content.split('\n\n'):
                     if paragraph.strip():
-                        self.document_store.append({
-                            "content": paragraph.strip(),
-                            "metadata": {"section": section}
-                        })
+                        self._append_doc(paragraph.strip(), {"section": section})
         self._build_index()
 
-    def add_trending_hashtags(self, hashtags):
+    def _append_doc(self, content, metadata):
+        doc = {"id": self._next_id, "content": content, "metadata": metadata}
+        self._next_id += 1
+        self.document_store.append(doc)
+        self.bm25.add(doc["id"], content)
+        return doc
+
+    def add_trending_hashtags(self, hashtags, replace_id=None):
+        """
+        Add a trending-hashtags document and return its id. It replaces the
+        previous trend document (or replace_id, if given), so only the latest
+        trends stay in the store across runs.
+        """
         if not hashtags:
-            return
-        self.document_store.append({
+            return None
+        stale = [i for i in (self._trend_doc_id, replace_id) if i is not None]
+        if stale:
+            self.remove_documents(stale)
+        ids = self.add_documents([{
             "content": "Trending hashtags: "+", ".join(hashtags),
             "metadata": {"section": "trending_hashtags"}
-        })
-        self._build_index()
+        }])
+        self._trend_doc_id = ids[0]
+        return ids[0]
+
+    def add_documents(self, docs):
+        """
+        Embed only the given documents and append them to the live index.
+        Returns the ids assigned to the new documents.
+        """
+        if not docs:
+            return []
+        new_docs = [self._append_doc(d["content"], d.get("metadata", {})) for d in docs]
+        keys, new_embeddings = self._embed_documents([d["content"] for d in new_docs])
+        ids = np.array([d["id"] for d in new_docs], dtype='int64')
+        if self.index is None:
+            self.index = self._new_index(new_embeddings)
+        start = len(self.document_store) - len(new_docs)
+        self._store_embeddings(start, new_embeddings)
+        for offset, (doc, key) in enumerate(zip(new_docs, keys)):
+            self._id_to_pos[doc["id"]] = start + offset
+            self._key_to_pos[key] = start + offset
+        self._doc_keys += keys
+        self.index.add_with_ids(new_embeddings, ids)
+        if self.index_type == "auto" and \
+                ann_index.choose_index_type(len(self.document_store)) != self._auto_index_type:
+            # The corpus has outgrown the backend "auto" picked; retrain on everything stored
+            self._index_embeddings()
+        return ids.tolist()
+
+    def remove_documents(self, doc_ids):
+        """
+        Drop documents by id from the store, the embeddings matrix and the index.
+        Each removed slot is filled with the last document, so removal cost does
+        not grow with the size of the store.
+        """
+        doc_ids = list(dict.fromkeys(i for i in doc_ids if i in self._id_to_pos))
+        if not doc_ids:
+            return 0
+        for doc_id in doc_ids:
+            self.bm25.remove(doc_id)
+            pos = self._id_to_pos.pop(doc_id)
+            key = self._doc_keys[pos]
+            if self._key_to_pos.get(key) == pos:
+                del self._key_to_pos[key]
+            last = len(self.document_store) - 1
+            if pos != last:
+                moved = self.document_store[last]
+                moved_key = self._doc_keys[last]
+                self.document_store[pos] = moved
+                self._doc_keys[pos] = moved_key
+                self._emb_buffer[pos] = self._emb_buffer[last]
+                self._id_to_pos[moved["id"]] = pos
+                if self._key_to_pos.get(moved_key) == last:
+                    self._key_to_pos[moved_key] = pos
+            self.document_store.pop()
+            self._doc_keys.pop()
+        self.embeddings = self._emb_buffer[:len(self.document_store)]
+        try:
+            self.index.remove_ids(np.array(doc_ids, dtype='int64'))
+        except RuntimeError:
+            # HNSW cannot delete in place; rebuild from the stored vectors instead.
+            self._index_embeddings()
+        return len(doc_ids)
+
+    def replace_document(self, doc_id, content, metadata=None):
+        self.remove_documents([doc_id])
+        return self.add_documents([{"content": content, "metadata": metadata or {}}])[0]
+
+    def memory_usage(self):
+        """Approximate bytes held by the embeddings buffer and the index."""
+        total = 0
+        if self._emb_buffer is not None:
+            total += self._emb_buffer.nbytes
+        if self.index is not None:
+            total += ann_index.index_nbytes(self.index)
+        return total
+
+    def _embed(self, texts):
+        return np.asarray(self.embedding_model.encode(texts), dtype='float32')
+
+    def _embedding_key(self, text):
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode('utf-8')).hexdigest()
+
+    def _embed_documents(self, texts):
+        """
+        Return (content hashes, embeddings) for document texts. Rows already in
+        the embeddings buffer are reused; only unseen content is encoded.
+        """
+        keys = [self._embedding_key(t) for t in texts]
+        missing = [i for i, key in enumerate(keys) if key not in self._key_to_pos]
+        encoded = self._embed([texts[i] for i in missing]) if missing else None
+        rows = np.empty((len(texts), encoded.shape[1] if missing else self._emb_buffer.shape[1]), dtype='float32')
+        for i, key in enumerate(keys):
+            if key in self._key_to_pos:
+                rows[i] = self._emb_buffer[self._key_to_pos[key]]
+        if missing:
+            rows[missing] = encoded
+        return keys, rows
+
+    def _new_index(self, vectors):
+        if self.index_type == "auto":
+            self._auto_index_type = ann_index.choose_index_type(len(vectors))
+        return ann_index.build_index(vectors, self.index_type)
+
+    def _index_embeddings(self):
+        """(Re)build the FAISS index from the stored embeddings without re-encoding."""
+        if not self.document_store:
+            self.index = None
+            return
+        self.index = self._new_index(self.embeddings)
+        ids = np.array([doc["id"] for doc in self.document_store], dtype='int64')
+        self.index.add_with_ids(self.embeddings, ids)
+
+    def _store_embeddings(self, start, rows):
+        # Grow the backing buffer geometrically so appends stay amortised O(1).
+        end = start + len(rows)
+        if self._emb_buffer is None or end > len(self._emb_buffer):
+            capacity = max(end, 2 * (len(self._emb_buffer) if self._emb_buffer is not None else 0), 64)
+            buffer = np.empty((capacity, rows.shape[1]), dtype='float32')
+            if start:
+                buffer[:start] = self._emb_buffer[:start]
+            self._emb_buffer = buffer
+        self._emb_buffer[start:end] = rows
+        self.embeddings = self._emb_buffer[:end]
+
+    def _reindex_positions(self, keys):
+        self._id_to_pos = {doc["id"]: pos for pos, doc in enumerate(self.document_store)}
+        self._doc_keys = list(keys)
+        self._key_to_pos = {key: pos for pos, key in enumerate(self._doc_keys)}
 
     def _build_index(self):
+        # Embed before dropping the old buffer so unchanged documents reuse their rows
+        keys, rows = self._embed_documents([doc["content"] for doc in self.document_store]) \
+            if self.document_store else ([], None)
+        self.index = None
+        self.embeddings = None
+        self._emb_buffer = None
+        self._reindex_positions(keys)
         if not self.document_store:
             return
-        docs = [doc["content"] for doc in self.document_store]
-        self.embeddings = np.array(self.embedding_model.encode(docs)).astype('float32')
-        dim = self.embeddings.shape[1]
-        self.index = faiss.IndexFlatL2(dim)
-        self.index.add(self.embeddings)
-
-    def search(self, query, k=3):
-        if not self.index or not self.document_store:
+        self._store_embeddings(0, rows)
+        self._index_embeddings()
+
+    def save_to_disk(self, path="company_rag.pkl"):
+        """
+        Snapshot the store next to `path`: metadata in `path`, embeddings in a
+        `.npy` and the FAISS index in a `.faiss` file.
+        """
+        base = os.path.splitext(path)[0]
+        embeddings = self.embeddings if self.embeddings is not None else np.empty((0, 0), dtype='float32')
+        _replace_atomically(base + ".npy", lambda f: np.save(f, embeddings))
+        if self.index is not None:
+            _replace_atomically(base + ".faiss", lambda f: f.write(_faiss().serialize_index(self.index).tobytes()))
+        elif os.path.exists(base + ".faiss"):
+            os.remove(base + ".faiss")
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "model_name": self.model_name,
+            "source_hash": self._source_hash,
+            "company_info": self.company_info,
+            "document_store": self.document_store,
+            "next_id": self._next_id,
+            "trend_doc_id": self._trend_doc_id,
+            "bm25": self.bm25,
+            "embedding_keys": self._doc_keys,
+        }
+        _replace_atomically(path, lambda f: pickle.dump(meta, f))
+        return True
+
+    def load_from_disk(self, path="company_rag.pkl"):
+        """
+        Restore a snapshot written by save_to_disk. Returns False if it is
+        missing, unreadable or was built with a different embedding model.
+        """
+        base = os.path.splitext(path)[0]
+        try:
+            with open(path, 'rb') as f:
+                meta = pickle.load(f)
+            # Read into memory rather than mmap: a mapped file cannot be replaced by the next
+            # save_to_disk on Windows.
+            embeddings = np.load(base + ".npy")
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError) as e:
+            print(f"Could not load RAG snapshot {path}: {e}")
+            return False
+        if meta.get("version") != SNAPSHOT_VERSION or meta.get("model_name") != self.model_name:
+            return False
+        if len(meta["embedding_keys"]) != len(embeddings):
+            return False
+
+        self.company_info = meta["company_info"]
+        self.document_store = meta["document_store"]
+        self.bm25 = meta["bm25"]
+        self._next_id = meta["next_id"]
+        self._trend_doc_id = meta["trend_doc_id"]
+        self._source_hash = meta["source_hash"]
+        self._reindex_positions(meta["embedding_keys"])
+        self.index = None
+        self.embeddings = None
+        self._emb_buffer = None
+        if not self.document_store:
+            return True
+        self._store_embeddings(0, np.asarray(embeddings, dtype='float32'))
+        if os.path.exists(base + ".faiss"):
+            self.index = _faiss().read_index(base + ".faiss")
+            self._auto_index_type = ann_index.choose_index_type(len(self.document_store))
+            ann_index.set_search_params(self.index)
+        else:
+            self._index_embeddings()
+        return True
+
+    def _embed_queries(self, queries):
+        """
+        Embed queries through the LRU cache; all misses go to the model in one batch.
+        """
+        rows = [self.query_cache.get(q) for q in queries]
+        missing = list(dict.fromkeys(q for q, row in zip(queries, rows) if row is None))
+        if missing:
+            fresh = dict(zip(missing, self._embed(missing)))
+            for q, row in fresh.items():
+                self.query_cache.put(q, row)
+            rows = [fresh[q] if row is None else row for q, row in zip(queries, rows)]
+        return np.vstack(rows).astype('float32', copy=False)
+
+    def search_many(self, queries, k=3, mode=None):
+        """
+        Run several queries and return one list of documents per query, in order.
+
+        "dense" uses FAISS only, "keyword" uses BM25 only, and "hybrid" fuses
+        both but skips the embedding entirely when BM25 is confident and
+        already has k matches. All queries that need embeddings are encoded
+        in one batch and searched with a single index.search call.
+        """
+        mode = mode or self.retrieval_mode
+        if not queries:
             return []
-        q_emb = np.array(self.embedding_model.encode([query])).astype('float32')
-        dists, ids = self.index.search(q_emb, k=min(k, len(self.document_store)))
-        return [self.document_store[i] for i in ids[0]]
+        if not self.document_store:
+            return [[] for _ in queries]
+        k = min(k, len(self.document_store))
+        pool = min(k * CANDIDATE_FACTOR, len(self.document_store))
 
-    def generate_content(self, event, hashtags=None, yt_trends=None):
+        results = [None] * len(queries)
+        lexical = [[] for _ in queries]
+        if mode != "dense":
+            for i, query in enumerate(queries):
+                lexical[i] = self.bm25.search(query, pool)
+                if mode == "keyword":
+                    results[i] = [doc_id for doc_id, _ in lexical[i][:k]]
+                elif len(lexical[i]) >= k and self.bm25.is_confident(query, lexical[i]):
+                    results[i] = [doc_id for doc_id, _ in lexical[i][:k]]
+                    self.keyword_fast_path_hits += 1
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        if pending and self.index is not None:
+            q_emb = self._embed_queries([queries[i] for i in pending])
+            dists, ids = self.index.search(q_emb, k=k if mode == "dense" else pool)
+            for row, i in enumerate(pending):
+                dense = [(int(doc_id), float(dist)) for doc_id, dist in zip(ids[row], dists[row])
+                         if doc_id in self._id_to_pos]
+                if mode == "dense":
+                    results[i] = [doc_id for doc_id, _ in dense]
+                else:
+                    results[i] = fuse_scores(dense, lexical[i], k, self.hybrid_alpha)
+        return [[self.document_store[self._id_to_pos[doc_id]] for doc_id in (r or [])] for r in results]
+
+    def search(self, query, k=3, mode=None):
+        return self.search_many([query], k, mode)[0]
+
+    def build_prompt(self, event, hashtags=None, yt_trends=None):
         docs_context = "\n".join(doc["content"] for doc in self.search(event['about'] + " " + event['name']))
         tags = ", ".join(hashtags) if hashtags else ""
         yt_text = "\n".join(f"- {t['title']} ({t['video_url']}) {', '.join(t['hashtags'])}" for t in yt_trends) if yt_trends else ""
-        prompt = f"""You are a social media strategist for a student club.
+        return f"""You are a social media strategist for a student club.
 Club context: {docs_context}
 Event details: {event}
 Instagram hashtags: {tags}
@@ -82,5 +407,52 @@ YouTube trends:
 2. Suggest 2 trending reel ideas (with themes).
 3. Suggest 3 suitable audio tracks with reasons.
 4. Merge Instagram & YouTube hashtags into one set."""
-        resp = model.generate_content(prompt)
-        return resp.text if hasattr(resp, "text") else str(resp)
+
+    def _cached_generation(self, event, prompt):
+        """Return (cache_key, text) where text is None when neither cache has an answer."""
+        key = prompt_cache_key(prompt, self.llm_model)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return key, cached["text"]
+        if self.semantic_cache is not None:
+            similar = self.semantic_cache.lookup(event)
+            if similar is not None:
+                return key, similar[0]
+        return key, None
+
+    def _remember_generation(self, key, event, text, seconds):
+        if self.response_cache is not None:
+            self.response_cache.set(key, {"text": text, "model": self.llm_model})
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(event, text, seconds)
+
+    def generate_content(self, event, hashtags=None, yt_trends=None):
+        prompt = self.build_prompt(event, hashtags, yt_trends)
+        key, text = self._cached_generation(event, prompt)
+        if text is not None:
+            return text
+        start = time.perf_counter()
+        resp = get_llm(self.llm_model).generate_content(prompt)
+        text = resp.text if hasattr(resp, "text") else str(resp)
+        self._remember_generation(key, event, text, time.perf_counter() - start)
+        return text
+
+    def generate_content_stream(self, event, hashtags=None, yt_trends=None):
+        """
+        Like generate_content but yields text chunks as the LLM produces them.
+        Cached answers are yielded as a single chunk.
+        """
+        prompt = self.build_prompt(event, hashtags, yt_trends)
+        key, text = self._cached_generation(event, prompt)
+        if text is not None:
+            yield text
+            return
+        start = time.perf_counter()
+        parts = []
+        for chunk in get_llm(self.llm_model).generate_content(prompt, stream=True):
+            piece = chunk.text if hasattr(chunk, "text") else str(chunk)
+            if piece:
+                parts.append(piece)
+                yield piece
+        self._remember_generation(key, event, "".join(parts), time.perf_counter() - start)
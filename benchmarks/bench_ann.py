@@ -0,0 +1,81 @@
+"""
+Recall@k, query latency and memory of the ANN backends against the flat baseline
+on synthetic clustered embeddings.
+
+Each index is built in its own fresh process, so "peak RSS" is the high-water
+mark of a process that generated the vectors and built only that index
+(ru_maxrss never goes down, so it cannot be read per index within one process).
+
+Run from the repository root:
+    python -m benchmarks.bench_ann --sizes 1000 100000 1000000
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend import ann_index
+
+
+def synthetic_embeddings(n, dim, seed=0, clusters=256):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim), dtype='float32')
+    vectors = centers[rng.integers(0, clusters, n)] + 0.3 * rng.standard_normal((n, dim), dtype='float32')
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def recall_at_k(found, truth):
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def measure(n, dim, index_type, n_queries, k):
+    """Build and query one index; runs in a child process."""
+    import faiss
+    vectors = synthetic_embeddings(n, dim)
+    queries = synthetic_embeddings(n_queries, dim, seed=1)
+    start = time.perf_counter()
+    index = ann_index.build_index(vectors, index_type)
+    index.add_with_ids(vectors, np.arange(n, dtype='int64'))
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for q in queries:
+        index.search(q[None, :], k)
+    latency = (time.perf_counter() - start) / len(queries) * 1000
+    _, found = index.search(queries, k)
+    size_mb = faiss.serialize_index(index).nbytes / 2**20
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return ann_index.describe(index), build, latency, found, size_mb, rss_mb
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--types", nargs="+", default=["flat", "ivf", "hnsw", "ivfpq", "sq8", "fp16"])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'n':>9} {'index':>8} {'built as':>22} {'build s':>8} {'recall@k':>9} "
+          f"{'ms/query':>9} {'index MB':>9} {'peak RSS MB':>12}")
+    for n in args.sizes:
+        truth = None
+        for index_type in ["flat"] + [t for t in args.types if t != "flat"]:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as child:
+                built_as, build, latency, found, size_mb, rss_mb = child.submit(
+                    measure, n, args.dim, index_type, args.queries, args.k).result()
+            if truth is None:
+                truth = found
+            print(f"{n:>9} {index_type:>8} {built_as:>22} {build:>8.2f} "
+                  f"{recall_at_k(found, truth):>9.3f} {latency:>9.3f} {size_mb:>9.1f} {rss_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Load test for the trends API: requests/second and latency percentiles under
+concurrent clients, for one or more servers side by side.
+
+To compare before/after, start the old build on one port and the current one
+on another (e.g. from a `git worktree` of the baseline commit), then:
+
+Run from the repository root:
+    python -m benchmarks.bench_api_load --target sync=http://127.0.0.1:8001 --target async=http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def hammer(base_url, path, requests, concurrency):
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker(client):
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await client.get(path)  # warm up the connection and server caches
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", action="append", required=True, help="label=base_url, repeatable")
+    parser.add_argument("--path", action="append", help="endpoint(s) to hit (default /trends and /trends/top)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    paths = args.path or ["/trends", "/trends/top?window=7d&limit=20"]
+    print(f"{'target':<12}{'path':<36}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for target in args.target:
+        label, _, base_url = target.partition("=")
+        for path in paths:
+            latencies, errors, elapsed = asyncio.run(hammer(base_url, path, args.requests, args.concurrency))
+            if not latencies:
+                print(f"{label:<12}{path:<36}{'-':>10}{'-':>10}{'-':>10}{errors:>8}")
+                continue
+            rps = len(latencies) / elapsed
+            p50 = statistics.median(latencies) * 1000
+            p99 = percentile(latencies, 99) * 1000
+            print(f"{label:<12}{path:<36}{rps:>10.1f}{p50:>10.1f}{p99:>10.1f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Fit-to-box layout of long event descriptions: the naive approach (step the
+font size down one point at a time, re-measuring every candidate line with
+FreeType) against layout.fit_text (binary search over sizes, widths from
+memoized glyph tables).
+
+Pass --font with a real .ttf path; PIL's fallback bitmap font has one size.
+
+Run from the repository root:
+    python -m benchmarks.bench_layout --font arial.ttf --descriptions 50
+"""
+import argparse
+import random
+import time
+
+from backend.poster import layout
+
+WORDS = ("join us for an evening of talks workshops and demos with mentors from industry alumni and "
+         "student teams covering robotics machine learning embedded systems design web development "
+         "cloud infrastructure security pizza networking prizes beginners welcome bring your laptop").split()
+
+
+def make_corpus(n, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 160))).capitalize() + "."
+            for _ in range(n)]
+
+
+def naive_fit(text, font_path, box_width, box_height, max_size, min_size):
+    for size in range(max_size, min_size - 1, -1):
+        font = layout.get_font(font_path, size)
+        lines, current = [], ""
+        for word in text.split():
+            candidate = f"{current} {word}" if current else word
+            if current and font.getlength(candidate) > box_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        lines.append(current)
+        if len(lines) * layout.line_height(font) <= box_height:
+            break
+    return font, lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font", default="arial.ttf")
+    parser.add_argument("--descriptions", type=int, default=20)
+    parser.add_argument("--box", type=int, nargs=2, default=[960, 300], metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--max-size", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.descriptions)
+    box_width, box_height = args.box
+    min_size = layout.MIN_FONT_SIZE
+
+    # Fonts are loaded up front so both approaches only pay for measuring
+    for size in range(min_size, args.max_size + 1):
+        layout.get_font(args.font, size)
+
+    start = time.perf_counter()
+    naive_sizes = [naive_fit(text, args.font, box_width, box_height, args.max_size, min_size)[0].size
+                   for text in corpus]
+    naive = time.perf_counter() - start
+
+    layout.glyph_widths.cache_clear()
+    start = time.perf_counter()
+    fitted = [layout.fit_text(text, args.font, box_width, box_height, args.max_size) for text in corpus]
+    fast = time.perf_counter() - start
+
+    agree = sum(a == f[0].size for a, f in zip(naive_sizes, fitted))
+    print(f"{len(corpus)} descriptions into {box_width}x{box_height}")
+    print(f"naive:    {naive * 1000 / len(corpus):7.2f} ms per description")
+    print(f"fit_text: {fast * 1000 / len(corpus):7.2f} ms per description  {naive / fast:.1f}x")
+    print(f"same font size chosen for {agree}/{len(corpus)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+End-to-end latency of the old sequential flow vs. backend.pipeline, against
+the local fake Apify/YouTube API and the offline FakeLLM.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline --apify-delay 1.5 --youtube-delay 0.8 --llm-seconds 1.0
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from backend import pipeline
+from backend.llm import FakeLLM
+from backend.poster.poster import generate_poster
+from backend.poster.store import PosterStore
+from backend.registry import register_llm
+from backend.scraping import fake_server, instagram_scraper, youtube_scraper
+from backend.updated_company_rag import CompanyRAG
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apify-delay", type=float, default=1.5)
+    parser.add_argument("--youtube-delay", type=float, default=0.8)
+    parser.add_argument("--llm-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server, base_url = fake_server.serve(apify_delay=args.apify_delay, youtube_delay=args.youtube_delay)
+    instagram_scraper.APIFY_BASE_URL = base_url
+    # Both scrapers get a throwaway cache so nothing persists in storage/ across runs
+    scrape_cache = os.path.join(tempfile.mkdtemp(), "scrape_cache.sqlite3")
+    instagram_scraper.SCRAPE_CACHE_PATH = scrape_cache
+    youtube_scraper.SCRAPE_CACHE_PATH = scrape_cache
+    youtube_scraper.YOUTUBE_API_URL = base_url + "/youtube/v3"
+    register_llm("bench-local", FakeLLM(first_token_delay=args.llm_seconds, chunk_delay=0))
+    rag = CompanyRAG(llm_model="bench-local")
+    event = {"name": "Hack Night", "about": "Overnight hackathon with mentors", "date": "Friday",
+             "time": "7 PM", "venue": "Lab 3"}
+    topics = ["hackathon", "coding"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        tags = instagram_scraper.scrape_instagram(topics)
+        trends = youtube_scraper.get_trending_reels(event["about"])
+        rag.generate_content(event, tags, trends)
+        for style in (1, 2, 3, 4):
+            generate_poster(event, rag.company_info, style, save_dir=tmp)
+        sequential = time.perf_counter() - start
+
+    # Fresh name, description and topics so neither the response nor the scrape caches are hit
+    event["name"] = "Hack Night II"
+    event["about"] = "All-night build sprint with pizza and mentors"
+    with tempfile.TemporaryDirectory() as tmp:
+        result = pipeline.run_pipeline(rag, event, ["hacknight", "programming"], store=PosterStore(tmp))
+    server.shutdown()
+
+    print(f"sequential: {sequential:6.2f} s")
+    print(f"pipeline:   {result['timings']['total']:6.2f} s")
+    for stage, seconds in sorted(result["timings"].items()):
+        print(f"  {stage:<10} {seconds:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
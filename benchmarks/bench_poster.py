@@ -0,0 +1,57 @@
+"""
+Per-style poster cost: building the static background layer (gradient and
+shapes) on its own, a cold render with the caches cleared so the background
+is rebuilt, and a warm render from the cached template. Both renders include
+the PNG encode.
+
+"py peak MB" is tracemalloc's peak for one cold render. It sees Python-level
+allocations only (such as a per-pixel list), not PIL's native image buffers.
+
+Run from the repository root:
+    python -m benchmarks.bench_poster --repeat 20
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from backend.poster.poster import HEIGHT, STYLES, WIDTH, clear_caches, encode_poster, render_poster
+
+EVENT = {"name": "Hack Night", "about": "Overnight hackathon with pizza and mentors",
+         "venue": "Lab 3", "date": "2026-03-14", "time": "7 PM"}
+
+
+def median_ms(fn, repeat, before=None):
+    timings = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--styles", type=int, nargs="+", default=[1, 2, 3, 4])
+    args = parser.parse_args()
+
+    print(f"{'style':<8}{'background ms':>15}{'cold+png ms':>13}{'warm+png ms':>13}{'py peak MB':>12}")
+    for style in args.styles:
+        encode_poster(render_poster(EVENT, style))  # load fonts once
+        background = median_ms(lambda: STYLES[style]["background"]((WIDTH, HEIGHT)), args.repeat)
+        cold = median_ms(lambda: encode_poster(render_poster(EVENT, style)), args.repeat, before=clear_caches)
+        warm = median_ms(lambda: encode_poster(render_poster(EVENT, style)), args.repeat)
+        # Measured on a separate run so tracing overhead doesn't skew the timings
+        clear_caches()
+        tracemalloc.start()
+        render_poster(EVENT, style)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{style:<8}{background:>15.1f}{cold:>13.1f}{warm:>13.1f}{peak / 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
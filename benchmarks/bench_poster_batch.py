@@ -0,0 +1,64 @@
+"""
+Batch poster rendering with and without the template/font caches, and
+across the worker pool, then a repeat of the batch against a poster store
+(what a Streamlit rerun costs). The cold pass clears the caches before every poster,
+which is what each render cost before templates were cached; the serial
+passes encode PNGs in-process so they are comparable with the pool.
+
+Run from the repository root:
+    python -m benchmarks.bench_poster_batch --events 100
+"""
+import argparse
+import tempfile
+import time
+
+from backend.poster.poster import RENDER_WORKERS, clear_caches, encode_poster, render_poster, render_posters
+from backend.poster.store import PosterStore
+
+
+def make_events(n):
+    return [{"name": f"Event {i}", "about": f"Session {i} of the weekly meetup series",
+             "venue": f"Room {100 + i % 20}", "date": f"2026-04-{1 + i % 28:02d}", "time": "6 PM"}
+            for i in range(n)]
+
+
+def run(events, styles, cold):
+    start = time.perf_counter()
+    for event in events:
+        for style in styles:
+            if cold:
+                clear_caches()
+            encode_poster(render_poster(event, style))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--styles", type=int, nargs="+", default=[1, 2, 3, 4])
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    renders = len(events) * len(args.styles)
+    cold = run(events, args.styles, cold=True)
+    clear_caches()
+    warm = run(events, args.styles, cold=False)
+    render_posters([(events[0], style) for style in args.styles])  # start the worker processes
+    start = time.perf_counter()
+    render_posters([(event, style) for event in events for style in args.styles])
+    parallel = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PosterStore(tmp)
+        render_posters([(event, style) for event in events for style in args.styles], store=store)
+        start = time.perf_counter()
+        render_posters([(event, style) for event in events for style in args.styles], store=store)
+        stored = time.perf_counter() - start
+    print(f"{renders} renders")
+    print(f"uncached: {cold:.2f}s ({renders / cold:.1f} posters/s)")
+    print(f"cached:   {warm:.2f}s ({renders / warm:.1f} posters/s)  {cold / warm:.1f}x")
+    print(f"pool x{RENDER_WORKERS}:  {parallel:.2f}s ({renders / parallel:.1f} posters/s)  {cold / parallel:.1f}x")
+    print(f"store hit: {stored:.2f}s ({renders / stored:.1f} posters/s)  {cold / stored:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Bytes per render and encode time for every aspect ratio and output format,
+plus the cost of one render_poster_set() call against separate renders.
+
+Run from the repository root:
+    python -m benchmarks.bench_poster_formats --style 4 --quality 75 85 95
+"""
+import argparse
+import statistics
+import time
+
+from backend.poster.poster import ASPECTS, ENCODERS, encode_poster, layout_poster, render_poster, render_poster_set
+
+EVENT = {"name": "Hack Night", "about": "Overnight hackathon with pizza and mentors",
+         "venue": "Lab 3", "date": "2026-03-14", "time": "7 PM"}
+
+
+def timed(fn, repeat):
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--style", type=int, default=4)
+    parser.add_argument("--quality", type=int, nargs="+", default=[85])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    layout = layout_poster(EVENT, args.style)
+    print(f"{'aspect':<10}{'format':<12}{'KB':>8}{'encode ms':>11}")
+    for aspect, size in ASPECTS.items():
+        poster = render_poster(EVENT, args.style, size, layout)
+        for fmt, options in ENCODERS.items():
+            for quality in (args.quality if "quality" in options else [None]):
+                data, seconds = timed(lambda: encode_poster(poster, fmt, quality), args.repeat)
+                label = fmt if quality is None else f"{fmt} q{quality}"
+                print(f"{aspect:<10}{label:<12}{len(data) / 1024:>8.1f}{seconds * 1000:>11.1f}")
+
+    def shared_layout():
+        shared = layout_poster(EVENT, args.style)
+        return [render_poster(EVENT, args.style, size, shared) for size in ASPECTS.values()]
+
+    _, separate = timed(lambda: [render_poster(EVENT, args.style, size) for size in ASPECTS.values()], args.repeat)
+    _, shared = timed(shared_layout, args.repeat)
+    posters, full = timed(lambda: render_poster_set(EVENT, style=args.style, fmt="webp"), args.repeat)
+    print()
+    print(f"{len(ASPECTS)} aspects, layout per aspect: {separate * 1000:.1f} ms")
+    print(f"{len(ASPECTS)} aspects, shared layout:     {shared * 1000:.1f} ms")
+    print(f"render_poster_set (webp):     {full * 1000:.1f} ms, {sum(map(len, posters.values())) / 1024:.1f} KB total")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Latency of incremental CompanyRAG updates as the document store grows:
+plain add_documents calls, and add_trending_hashtags replacing the previous
+trend document.
+
+Run from the repository root:
+    python -m benchmarks.bench_rag_incremental --sizes 100 1000 5000
+"""
+import argparse
+import time
+
+from backend.updated_company_rag import CompanyRAG
+
+
+def filler_docs(n, offset=0):
+    return [{"content": f"Archived trend snapshot {offset + i}: #coding #hackathon #week{(offset + i) % 52}",
+             "metadata": {"section": "filler"}} for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rag = CompanyRAG()
+    print(f"{'store size':>10} | {'add (ms)':>9} | {'replace (ms)':>12} | {'full rebuild (ms)':>18}")
+    for size in sorted(args.sizes):
+        missing = size - len(rag.document_store)
+        if missing > 0:
+            rag.add_documents(filler_docs(missing, len(rag.document_store)))
+        store_size = len(rag.document_store)
+
+        added = []
+        start = time.perf_counter()
+        for i in range(args.repeats):
+            added += rag.add_documents([{"content": f"Trending hashtags: #fresh{i}, #coding",
+                                         "metadata": {"section": "trending_hashtags"}}])
+        add = (time.perf_counter() - start) / args.repeats * 1000
+        rag.remove_documents(added)
+
+        start = time.perf_counter()
+        for i in range(args.repeats):
+            rag.add_trending_hashtags([f"#trend{i}", "#coding"])
+        replace = (time.perf_counter() - start) / args.repeats * 1000
+
+        rag._key_to_pos.clear()  # make the rebuild re-encode every document
+        start = time.perf_counter()
+        rag._build_index()
+        rebuild = (time.perf_counter() - start) * 1000
+        print(f"{store_size:>10} | {add:>9.2f} | {replace:>12.2f} | {rebuild:>18.2f}")
+
+if __name__ == "__main__":
+    main()
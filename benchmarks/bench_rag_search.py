@@ -0,0 +1,35 @@
+"""
+Per-query search vs. batched search_many, cold and with a warm query cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_rag_search --events 50
+"""
+import argparse
+import time
+
+from backend.updated_company_rag import CompanyRAG
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=50)
+    args = parser.parse_args()
+
+    rag = CompanyRAG()
+    queries = [f"Hack night {i} coding challenge with prizes HackNight{i}" for i in range(args.events)]
+
+    def run(label, fn):
+        start = time.perf_counter()
+        fn()
+        print(f"{label:<28} {(time.perf_counter() - start) * 1000:10.2f} ms")
+
+    rag.query_cache.clear()
+    run("search() one by one, cold", lambda: [rag.search(q) for q in queries])
+    rag.query_cache.clear()
+    run("search_many(), cold", lambda: rag.search_many(queries))
+    run("search_many(), warm cache", lambda: rag.search_many(queries))
+    print("query cache:", rag.query_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
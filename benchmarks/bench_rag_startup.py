@@ -0,0 +1,39 @@
+"""
+Cold-start time of CompanyRAG with and without an on-disk snapshot.
+
+Run from the repository root:
+    python -m benchmarks.bench_rag_startup
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from backend.updated_company_rag import CompanyRAG
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json-path", default="data/company_details.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, "company_rag.pkl")
+        _, no_snapshot = timed(lambda: CompanyRAG(json_path=args.json_path))
+        _, first = timed(lambda: CompanyRAG(json_path=args.json_path, snapshot_path=snapshot))
+        rag, warm = timed(lambda: CompanyRAG(json_path=args.json_path, snapshot_path=snapshot))
+
+    print(f"no snapshot:          {no_snapshot:10.2f} ms")
+    print(f"first run (writes):   {first:10.2f} ms")
+    print(f"warm snapshot:        {warm:10.2f} ms")
+    print(f"model loaded on warm start: {rag._embedding_model is not None}")
+
+
+if __name__ == "__main__":
+    main()
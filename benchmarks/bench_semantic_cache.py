@@ -0,0 +1,41 @@
+"""
+Hit ratio and latency saved by the semantic cache over a slate of weekly,
+near-duplicate events. The LLM is a local stand-in that sleeps for
+--llm-seconds so no Gemini quota is used.
+
+Run from the repository root:
+    python -m benchmarks.bench_semantic_cache --weeks 12
+"""
+import argparse
+import time
+
+from backend.llm import FakeLLM
+from backend.registry import register_llm
+from backend.updated_company_rag import CompanyRAG
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--llm-seconds", type=float, default=2.0)
+    parser.add_argument("--threshold", type=float, default=0.92)
+    args = parser.parse_args()
+
+    register_llm("bench-local", FakeLLM(first_token_delay=args.llm_seconds, chunk_delay=0))
+    rag = CompanyRAG(llm_model="bench-local", semantic_cache_threshold=args.threshold)
+    events = [{"name": "Hack Night", "about": "Weekly overnight hackathon with pizza and mentors",
+               "date": f"2026-{1 + week // 4:02d}-{1 + 7 * (week % 4):02d}", "time": "7 PM",
+               "venue": "Lab 3"} for week in range(args.weeks)]
+    events.append({"name": "Resume Clinic", "about": "Career workshop reviewing student resumes",
+                   "date": "2026-05-02", "time": "5 PM", "venue": "Room 101"})
+
+    start = time.perf_counter()
+    for event in events:
+        rag.generate_content(event)
+    elapsed = time.perf_counter() - start
+    print(f"{len(events)} events in {elapsed:.2f} s (uncached would be ~{len(events) * args.llm_seconds:.2f} s)")
+    print("semantic cache:", rag.semantic_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
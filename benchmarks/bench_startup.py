@@ -0,0 +1,50 @@
+"""
+Startup cost: import time of the RAG module and time to the first query.
+Each measurement runs in a fresh interpreter so module caches do not leak.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import backend.updated_company_rag
+print((time.perf_counter() - start) * 1000)
+"""
+
+FIRST_QUERY_PROBE = """
+import time
+start = time.perf_counter()
+from backend.registry import get_rag
+rag = get_rag(snapshot_path={snapshot!r})
+rag.search("hackathon coding workshop")
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def run_probe(code):
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--snapshot", default="company_rag.pkl")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {
+        "import_ms": min(run_probe(IMPORT_PROBE) for _ in range(args.repeats)),
+        "first_query_ms": min(run_probe(FIRST_QUERY_PROBE.format(snapshot=args.snapshot))
+                              for _ in range(args.repeats)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
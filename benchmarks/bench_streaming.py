@@ -0,0 +1,32 @@
+"""
+Time to first chunk vs. total generation time for generate_content_stream,
+using the offline FakeLLM backend.
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming
+"""
+import time
+
+from backend.llm import FakeLLM
+from backend.registry import register_llm
+from backend.updated_company_rag import CompanyRAG
+
+
+def main():
+    register_llm("bench-local", FakeLLM())
+    rag = CompanyRAG(llm_model="bench-local")
+    event = {"name": "Hack Night", "about": "Overnight hackathon with mentors", "date": "Friday",
+             "time": "7 PM", "venue": "Lab 3"}
+
+    start = time.perf_counter()
+    first = None
+    for _ in rag.generate_content_stream(event):
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    print(f"time to first chunk: {first * 1000:8.1f} ms")
+    print(f"total generation:    {total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
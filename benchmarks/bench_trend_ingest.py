@@ -0,0 +1,64 @@
+"""
+Trend ingestion throughput and GET /trends latency at scale.
+
+Defaults to a throwaway SQLite file; pass --database-url for Postgres.
+
+Run from the repository root:
+    python -m benchmarks.bench_trend_ingest --rows 10000000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.models import Base, TrendingTopic
+from backend.trend_store import TREND_BUCKET, save_trends
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'trends.db')}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    # Each batch lands in its own hourly bucket, so every row is distinct.
+    start_ts = datetime.utcnow() - TREND_BUCKET * (args.rows // args.batch + 1)
+    written = 0
+    start = time.perf_counter()
+    with Session() as db:
+        for n, offset in enumerate(range(0, args.rows, args.batch)):
+            size = min(args.batch, args.rows - offset)
+            keywords = [f"#tag{(offset + i) % args.vocabulary}" for i in range(size)]
+            written += save_trends(db, "Instagram" if n % 2 else "YouTube", keywords,
+                                   now=start_ts + n * TREND_BUCKET + timedelta(minutes=1))
+    ingest = time.perf_counter() - start
+    print(f"ingested {written} rows in {ingest:.1f}s ({written / ingest:,.0f} rows/s)")
+
+    latencies = []
+    with Session() as db:
+        for _ in range(args.queries):
+            start = time.perf_counter()
+            # Same query as GET /trends
+            db.query(TrendingTopic).order_by(TrendingTopic.timestamp.desc()).limit(10).all()
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(f"GET /trends: p50 {statistics.median(latencies):.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
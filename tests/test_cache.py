@@ -0,0 +1,139 @@
+import pytest
+
+from backend import cache as cache_module
+from backend.cache import LRUCache, SQLiteCache, prompt_cache_key
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(**kwargs):
+        c = SQLiteCache(str(tmp_path / "cache.sqlite3"), **kwargs)
+        caches.append(c)
+        return c
+
+    yield make
+    for c in caches:
+        c._conn.close()
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(maxsize=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1
+    lru.put("c", 3)
+    assert "b" not in lru and "a" in lru and "c" in lru
+    assert lru.get("b", "missing") == "missing"
+    assert lru.stats()["hits"] == 1 and lru.stats()["misses"] == 1
+
+
+def test_prompt_cache_key_ignores_whitespace():
+    assert prompt_cache_key("a  b\n c", "m") == prompt_cache_key(" a b c ", "m")
+    assert prompt_cache_key("a b c", "m") != prompt_cache_key("a b c", "other")
+
+
+def test_round_trip_and_persistence(make_cache):
+    c = make_cache()
+    c.set("k", {"tags": ["ai"], "n": 1})
+    assert c.get("k") == {"tags": ["ai"], "n": 1}
+    assert c.get("missing", "default") == "default"
+
+    reopened = make_cache()
+    assert len(reopened) == 1
+    assert reopened.get("k") == {"tags": ["ai"], "n": 1}
+
+
+def test_ttl_expiry(make_cache, clock):
+    c = make_cache(ttl=60)
+    c.set("k", 1)
+    clock.now += 59
+    assert c.get("k") == 1
+    clock.now += 2
+    assert c.get("k") is None
+    assert len(c) == 0
+
+
+def test_purge_expired(make_cache, clock):
+    c = make_cache(ttl=60)
+    c.set("old", 1)
+    clock.now += 30
+    c.set("new", 2)
+    clock.now += 40
+    assert c.purge_expired() == 1
+    assert len(c) == 1
+    assert c.get("new") == 2
+
+
+def test_max_entries_evicts_least_recently_used(make_cache, clock):
+    c = make_cache(max_entries=2)
+    c.set("a", 1)
+    clock.now += 1
+    c.set("b", 2)
+    clock.now += 1
+    c.get("a")
+    clock.now += 1
+    c.set("c", 3)
+    assert len(c) == 2
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+
+
+def test_overwrite_does_not_grow_count(make_cache):
+    c = make_cache(max_entries=2)
+    for i in range(5):
+        c.set("k", i)
+    assert len(c) == 1
+    assert c.get("k") == 4
+
+
+def test_get_many_skips_missing_and_expired(make_cache, clock):
+    c = make_cache(ttl=60)
+    c.set("stale", 0)
+    clock.now += 61
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get_many(["a", "b", "stale", "missing"]) == {"a": 1, "b": 2}
+
+
+def test_recent_is_fresh_entries_newest_first(make_cache, clock):
+    c = make_cache(ttl=60)
+    c.set("stale", "stale")
+    clock.now += 61
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        c.set(key, key)
+    clock.now += 1
+    c.get("a")
+    assert c.recent() == ["a", "c", "b"]
+    assert c.recent(limit=1) == ["a"]
+
+
+def test_delete(make_cache):
+    c = make_cache()
+    c.set("k", 1)
+    c.delete("k")
+    c.delete("k")
+    assert len(c) == 0
+    assert c.get("k") is None
+
+
+def test_rejects_bad_table_name(tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteCache(str(tmp_path / "c.sqlite3"), table="x; DROP TABLE y")
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from backend.scraping.jsonstream import iter_json_array
+
+ITEMS = [
+    {"id": 1, "caption": "launch night ]["},
+    {"id": 2, "caption": "quote \" and \\ backslash, {braces}"},
+    {"id": 3, "tags": ["a", "b"], "nested": {"x": [1, 2, {"y": None}]}},
+    {"id": 4, "caption": "café \U0001f680"},
+]
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_items_survive_any_chunk_boundary(size):
+    data = json.dumps(ITEMS, ensure_ascii=False).encode("utf-8")
+    assert list(iter_json_array(chunked(data, size))) == ITEMS
+
+
+def test_accepts_str_chunks_and_whitespace():
+    data = ' \n[ {"a": 1} ,\n {"b": 2}\t]\n'
+    assert list(iter_json_array(chunked(data, 4))) == [{"a": 1}, {"b": 2}]
+
+
+def test_empty_array():
+    assert list(iter_json_array([b"[", b"]"])) == []
+
+
+def test_items_are_yielded_before_the_stream_ends():
+    def chunks():
+        yield b'[{"a": 1}, '
+        raise AssertionError("read past the first item")
+
+    assert next(iter_json_array(chunks())) == {"a": 1}
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError, match="Truncated"):
+        list(iter_json_array([b'[{"a": 1}, {"b": ']))
+
+
+def test_non_array_raises():
+    with pytest.raises(ValueError, match="Expected a JSON array"):
+        list(iter_json_array([b'{"a": 1}']))
@@ -0,0 +1,107 @@
+import hashlib
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from backend import registry
+from backend.updated_company_rag import CompanyRAG
+
+MODEL = "stub-encoder"
+DIM = 32
+
+
+class StubEncoder:
+    """Deterministic bag-of-words vectors; identical text always gets an identical row."""
+
+    def encode(self, texts):
+        rows = np.zeros((len(texts), DIM), dtype='float32')
+        for row, text in zip(rows, texts):
+            for word in text.lower().split():
+                row[int(hashlib.md5(word.encode()).hexdigest(), 16) % DIM] += 1
+            row /= np.linalg.norm(row) or 1
+        return rows
+
+
+@pytest.fixture
+def rag(tmp_path, monkeypatch):
+    monkeypatch.setitem(registry._embedding_models, MODEL, StubEncoder())
+    path = tmp_path / "club.json"
+    path.write_text(json.dumps({"name": "CodeCrafters", "about": "A club for coding.\n\nWe run hackathons."}))
+    return CompanyRAG(model_name=MODEL, json_path=str(path))
+
+
+def assert_consistent(rag):
+    store = rag.document_store
+    assert rag.index.ntotal == len(store) == len(rag.embeddings) == len(rag._doc_keys)
+    assert rag._id_to_pos == {doc["id"]: pos for pos, doc in enumerate(store)}
+    expected = StubEncoder().encode([doc["content"] for doc in store])
+    np.testing.assert_allclose(rag.embeddings, expected, atol=1e-6)
+    for pos, doc in enumerate(store):
+        assert rag._doc_keys[pos] == rag._embedding_key(doc["content"])
+    for key, pos in rag._key_to_pos.items():
+        assert rag._doc_keys[pos] == key
+    # The index itself must only hold live ids, not rely on search() filtering them out
+    _, ids = rag.index.search(expected, len(store))
+    assert set(ids.ravel().tolist()) - {-1} == set(rag._id_to_pos)
+
+
+def add(rag, *words):
+    return rag.add_documents([{"content": f"event about {w}", "metadata": {"section": "test"}} for w in words])
+
+
+def test_remove_from_middle_and_end(rag):
+    ids = add(rag, "alpha", "bravo", "charlie", "delta", "echo")
+    assert_consistent(rag)
+
+    assert rag.remove_documents([ids[1], ids[-1], 12345]) == 2
+    assert_consistent(rag)
+    assert rag.remove_documents([ids[1]]) == 0
+
+    contents = {doc["content"] for doc in rag.document_store}
+    assert "event about bravo" not in contents and "event about echo" not in contents
+    assert "event about charlie" in contents
+
+
+def test_remove_everything_then_add(rag):
+    rag.remove_documents([doc["id"] for doc in rag.document_store])
+    assert rag.document_store == [] and rag.index.ntotal == 0
+    add(rag, "foxtrot")
+    assert_consistent(rag)
+
+
+def test_replace_keeps_store_in_sync(rag):
+    ids = add(rag, "alpha", "bravo", "charlie")
+    new_id = rag.replace_document(ids[0], "event about golf")
+    assert new_id not in ids
+    assert_consistent(rag)
+
+    first = rag.add_trending_hashtags(["#one"])
+    second = rag.add_trending_hashtags(["#two"])
+    assert first not in rag._id_to_pos and second in rag._id_to_pos
+    assert_consistent(rag)
+
+
+def test_search_only_returns_live_docs(rag):
+    ids = add(rag, "alpha", "bravo", "charlie")
+    rag.remove_documents([ids[0]])
+    for mode in ("dense", "hybrid", "keyword"):
+        results = rag.search("event about alpha", k=len(rag.document_store), mode=mode)
+        assert results
+        assert all(doc["content"] != "event about alpha" for doc in results)
+        assert all(doc["id"] in rag._id_to_pos for doc in results)
+    assert rag.search("alpha", mode="keyword") == []
+
+
+def test_unchanged_content_is_not_re_encoded(rag, monkeypatch):
+    add(rag, "alpha", "bravo")
+    encoded = []
+    embed = rag._embed
+    monkeypatch.setattr(rag, "_embed", lambda texts: encoded.extend(texts) or embed(texts))
+
+    rag._build_index()
+    add(rag, "alpha", "hotel")
+    assert encoded == ["event about hotel"]
+    assert_consistent(rag)
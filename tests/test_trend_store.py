@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.models import Base, TrendingTopic, TrendRollupDaily, TrendRollupHourly
+from backend.trend_store import (
+    compact_trends, decode_cursor, encode_cursor, parse_window, rebuild_rollups, save_trends, top_trends,
+)
+
+NOW = datetime(2024, 5, 10, 12, 30)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_save_trends_dedups_within_bucket(db):
+    assert save_trends(db, "Instagram", ["#AI", "ai ", "Python", "", None], now=NOW) == 2
+    assert save_trends(db, "Instagram", ["ai"], now=NOW + timedelta(minutes=10)) == 1
+    counts = {row.normalized_keyword: row.count for row in db.query(TrendingTopic)}
+    assert counts == {"ai": 3, "python": 1}
+
+
+def test_new_bucket_adds_a_row(db):
+    save_trends(db, "Instagram", ["ai"], now=NOW)
+    save_trends(db, "Instagram", ["ai"], now=NOW + timedelta(hours=1))
+    assert db.query(TrendingTopic).count() == 2
+    assert db.query(TrendRollupHourly).count() == 2
+    assert [row.count for row in db.query(TrendRollupDaily)] == [2]
+
+
+def test_top_trends_window_and_platform(db):
+    save_trends(db, "Instagram", ["ai", "ai", "python"], now=NOW - timedelta(hours=2))
+    save_trends(db, "YouTube", ["python", "python", "python"], now=NOW - timedelta(hours=1))
+    save_trends(db, "Instagram", ["old"], now=NOW - timedelta(days=5))
+
+    day = top_trends(db, window="24h", now=NOW)["items"]
+    assert day == [{"keyword": "python", "count": 4}, {"keyword": "ai", "count": 2}]
+    week = top_trends(db, window="7d", platform="Instagram", now=NOW)["items"]
+    assert week == [{"keyword": "ai", "count": 2}, {"keyword": "old", "count": 1}, {"keyword": "python", "count": 1}]
+
+
+def test_cursor_pagination_walks_every_keyword_once(db):
+    keywords = [f"tag{i}" for i in range(7) for _ in range(i % 3 + 1)]
+    save_trends(db, "Instagram", keywords, now=NOW)
+
+    seen, cursor = [], None
+    while True:
+        page = top_trends(db, window="24h", limit=3, cursor=cursor, now=NOW)
+        seen += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 7
+    assert seen == sorted(seen, key=lambda item: (-item["count"], item["keyword"]))
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(5, "ai")) == (5, "ai")
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(5, "ai")[:-4], "W10="])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_parse_window():
+    assert parse_window("24h") == timedelta(hours=24)
+    assert parse_window(" 7D ") == timedelta(days=7)
+
+
+@pytest.mark.parametrize("window", ["", "0h", "7w", "-1d", "3651d", "1000000d"])
+def test_invalid_window(window):
+    with pytest.raises(ValueError):
+        parse_window(window)
+
+
+def test_compact_keeps_rollups_and_rebuild_restores_them(db):
+    save_trends(db, "Instagram", ["ai"], now=NOW - timedelta(days=40))
+    save_trends(db, "Instagram", ["ai", "python"], now=NOW)
+
+    assert compact_trends(db, now=NOW) == {"raw_deleted": 1, "hourly_deleted": 1}
+    assert top_trends(db, window="60d", now=NOW)["items"][0] == {"keyword": "ai", "count": 2}
+
+    rebuild_rollups(db)
+    assert db.query(TrendRollupHourly).count() == 2
+    assert top_trends(db, window="24h", now=NOW)["items"] == [{"keyword": "ai", "count": 1},
+                                                              {"keyword": "python", "count": 1}]